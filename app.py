@@ -11,15 +11,53 @@ import os
 import sys
 import time
 import argparse
+import functools
 import threading
+import json
 import logging
 from typing import Dict, Any, Optional, List
 
-# 导入核心模块
-from core.app_core import AppCore
-from core.utils import get_platform_info
+# 导入核心模块（AppCore等重量级模块在使用时再导入，保持 --version 路径轻量）
 from core.exceptions import EdgePlugHubException, ConfigError, PluginError
 
+# 插件操作的临时结果模板
+_NOT_IMPLEMENTED_RESULT = {
+    "success": False,
+    "plugin_id": None,
+    "error": "功能尚未实现"
+}
+
+# 插件操作类型 -> 日志中的名称
+_PLUGIN_OP_NAMES = {
+    "download": "下载",
+    "update": "更新"
+}
+
+# 插件列表的行格式及表头
+_PLUGIN_ROW_FORMAT = "{id:<20} {name:<20} {version:<10} {enabled:<10}"
+_PLUGIN_LIST_HEADER = {'id': 'ID', 'name': '名称', 'version': '版本', 'enabled': '状态'}
+
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """构建命令行参数解析器
+    
+    解析器只构建一次，重启时复用
+    
+    Returns:
+        argparse.ArgumentParser: 参数解析器
+    """
+    parser = argparse.ArgumentParser(description="EdgePlugHub - 插件管理平台")
+    
+    # 添加命令行参数
+    parser.add_argument("--version", action="store_true", help="显示版本信息并退出")
+    parser.add_argument("--gui", action="store_true", help="启动图形用户界面")
+    parser.add_argument("--list-plugins", action="store_true", help="列出可用的插件")
+    parser.add_argument("--download-plugin", metavar="PLUGIN_ID", help="下载并安装插件")
+    parser.add_argument("--update-plugin", metavar="PLUGIN_ID", help="更新插件")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="设置日志级别")
+    
+    return parser
+
 class EdgePlugHubApp:
     """EdgePlugHub应用程序主类"""
     
@@ -36,6 +74,7 @@ class EdgePlugHubApp:
         self.app_dir = os.path.dirname(os.path.abspath(__file__))
         
         # 创建核心应用
+        from core.app_core import AppCore
         self.core = AppCore("EdgePlugHub", self.app_dir)
         
         # 记录基本信息
@@ -44,6 +83,13 @@ class EdgePlugHubApp:
         self.event_system = self.core.event_system
         self.thread_manager = self.core.thread_manager
         
+        # 命令行参数名 -> 处理函数，按优先级排列
+        self._cli_handlers = (
+            ("list_plugins", self._list_plugins),
+            ("download_plugin", self._download_plugin),
+            ("update_plugin", self._update_plugin)
+        )
+        
         # 其他初始化工作
         self._init_modules()
         
@@ -59,18 +105,7 @@ class EdgePlugHubApp:
         Returns:
             解析后的参数对象
         """
-        parser = argparse.ArgumentParser(description="EdgePlugHub - 插件管理平台")
-        
-        # 添加命令行参数
-        parser.add_argument("--version", action="store_true", help="显示版本信息并退出")
-        parser.add_argument("--gui", action="store_true", help="启动图形用户界面")
-        parser.add_argument("--list-plugins", action="store_true", help="列出可用的插件")
-        parser.add_argument("--download-plugin", metavar="PLUGIN_ID", help="下载并安装插件")
-        parser.add_argument("--update-plugin", metavar="PLUGIN_ID", help="更新插件")
-        parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="设置日志级别")
-        
-        # 解析命令行参数
-        return parser.parse_args(args)
+        return _build_parser().parse_args(args)
     
     def _init_modules(self):
         """初始化模块"""
@@ -90,11 +125,11 @@ class EdgePlugHubApp:
         Args:
             data: 请求数据，包含plugin_id和callback
         """
-        if not isinstance(data, dict):
-            return
-        
-        plugin_id = data.get("plugin_id")
-        callback = data.get("callback")
+        try:
+            plugin_id = data["plugin_id"]
+            callback = data["callback"]
+        except (TypeError, KeyError):
+            plugin_id = callback = None
         
         if not plugin_id or not callable(callback):
             self.logger.error("插件下载请求无效，缺少plugin_id或callback")
@@ -103,22 +138,7 @@ class EdgePlugHubApp:
         self.logger.info(f"收到插件下载请求: {plugin_id}")
         
         # 在后续实现中，将通过线程管理器安全地执行下载
-        # 这里是临时的实现
-        def download_task():
-            result = {
-                "success": False,
-                "plugin_id": plugin_id,
-                "error": "功能尚未实现"
-            }
-            
-            try:
-                # 调用回调函数，确保在主线程中执行
-                callback(result)
-            except Exception as e:
-                self.logger.error(f"调用下载回调函数时出错: {str(e)}")
-        
-        # 创建并启动下载线程
-        self.thread_manager.run_task(download_task)
+        self.thread_manager.run_task(self._run_plugin_op, "download", plugin_id, callback)
     
     def _on_plugin_update_request(self, data):
         """处理插件更新请求
@@ -126,11 +146,11 @@ class EdgePlugHubApp:
         Args:
             data: 请求数据，包含plugin_id和callback
         """
-        if not isinstance(data, dict):
-            return
-        
-        plugin_id = data.get("plugin_id")
-        callback = data.get("callback")
+        try:
+            plugin_id = data["plugin_id"]
+            callback = data["callback"]
+        except (TypeError, KeyError):
+            plugin_id = callback = None
         
         if not plugin_id or not callable(callback):
             self.logger.error("插件更新请求无效，缺少plugin_id或callback")
@@ -139,22 +159,23 @@ class EdgePlugHubApp:
         self.logger.info(f"收到插件更新请求: {plugin_id}")
         
         # 在后续实现中，将通过线程管理器安全地执行更新
-        # 这里是临时的实现
-        def update_task():
-            result = {
-                "success": False,
-                "plugin_id": plugin_id,
-                "error": "功能尚未实现"
-            }
-            
-            try:
-                # 调用回调函数，确保在主线程中执行
-                callback(result)
-            except Exception as e:
-                self.logger.error(f"调用更新回调函数时出错: {str(e)}")
+        self.thread_manager.run_task(self._run_plugin_op, "update", plugin_id, callback)
+    
+    def _run_plugin_op(self, op, plugin_id, callback):
+        """在工作线程中执行插件操作（临时实现）
         
-        # 创建并启动更新线程
-        self.thread_manager.run_task(update_task)
+        Args:
+            op: 操作类型，"download" 或 "update"
+            plugin_id: 插件ID
+            callback: 结果回调函数
+        """
+        result = _NOT_IMPLEMENTED_RESULT.copy()
+        result["plugin_id"] = plugin_id
+        
+        try:
+            callback(result)
+        except Exception as e:
+            self.logger.error(f"调用{_PLUGIN_OP_NAMES.get(op, op)}回调函数时出错: {str(e)}")
     
     def start(self):
         """启动应用程序
@@ -163,30 +184,25 @@ class EdgePlugHubApp:
             bool: 是否成功启动
         """
         try:
-            # 启动核心服务
-            if not self.core.start():
-                self.logger.error("核心服务启动失败")
-                return False
-            
-            # 处理版本显示
+            # 处理版本显示，配置已在构造时加载，无需启动核心服务
             if self.args.version:
                 self._show_version()
                 return False
             
-            # 处理插件列表
-            if self.args.list_plugins:
-                self._list_plugins()
-                return False
-            
-            # 处理插件下载
-            if self.args.download_plugin:
-                self._download_plugin(self.args.download_plugin)
+            # 启动核心服务
+            if not self.core.start():
+                self.logger.error("核心服务启动失败")
                 return False
             
-            # 处理插件更新
-            if self.args.update_plugin:
-                self._update_plugin(self.args.update_plugin)
-                return False
+            # 处理一次性命令行操作（插件列表、下载、更新）
+            for attr, handler in self._cli_handlers:
+                value = getattr(self.args, attr)
+                if value:
+                    if value is True:
+                        handler()
+                    else:
+                        handler(value)
+                    return False
             
             # 标记为运行中
             self.logger.info("EdgePlugHub应用程序已启动")
@@ -205,17 +221,49 @@ class EdgePlugHubApp:
     
     def _show_version(self):
         """显示版本信息"""
-        version = self.config.get("app.version", "0.1.0")
-        build_date = self.config.get("app.build_date", "未知")
+        print_version(self.config.get)
+    
+    @functools.cached_property
+    def _plugin_manager(self):
+        """插件管理器引用，首次成功访问后缓存
         
-        print(f"EdgePlugHub v{version} (构建日期: {build_date})")
-        print(f"运行平台: {get_platform_info()['os_name']} {get_platform_info()['os_version']}")
-        print(f"Python版本: {get_platform_info()['python_version']}")
+        Raises:
+            PluginError: 插件管理器尚未初始化
+        """
+        plugin_manager = getattr(self.core, 'plugin_manager', None)
+        if plugin_manager is None:
+            raise PluginError("插件管理器尚未初始化")
+        return plugin_manager
     
     def _list_plugins(self):
-        """列出可用插件"""
-        # 这将在后续阶段实现
-        print("插件列表功能尚未实现")
+        """列出已安装的插件"""
+        try:
+            plugin_manager = self._plugin_manager
+        except PluginError as e:
+            print(f"错误: {e.message}")
+            return
+        
+        plugins = plugin_manager.get_all_plugins_info()
+        if not plugins:
+            print("没有已安装的插件")
+            return
+        
+        # 先在内存中拼好所有行，再一次性写出
+        rows = [_PLUGIN_ROW_FORMAT.format_map(_PLUGIN_LIST_HEADER)]
+        for plugin in plugins:
+            plugin_id = plugin.get('id')
+            row = {
+                'id': plugin_id,
+                'name': plugin.get('name') or plugin_id,
+                'version': plugin.get('version') or 'unknown',
+                'enabled': '启用' if plugin.get('enabled') else '禁用'
+            }
+            # 宽度格式不接受None等非字符串值，统一转换为字符串
+            rows.append(_PLUGIN_ROW_FORMAT.format_map({
+                key: '' if value is None else str(value) for key, value in row.items()
+            }))
+        rows.append('')
+        sys.stdout.write('\n'.join(rows))
     
     def _download_plugin(self, plugin_id):
         """下载并安装插件
@@ -275,13 +323,10 @@ class EdgePlugHubApp:
         })
         
         try:
-            # 等待退出事件
-            while self.core.running and not self.core.exit_event.is_set():
-                # 处理定时任务或命令
-                
-                # 休眠一段时间，避免CPU占用过高
-                time.sleep(0.1)
-                
+            # 阻塞等待退出事件，由操作系统挂起线程，避免轮询唤醒
+            if self.core.running:
+                self.core.exit_event.wait()
+
         except KeyboardInterrupt:
             self.logger.info("接收到键盘中断")
         except Exception as e:
@@ -297,11 +342,67 @@ class EdgePlugHubApp:
     def restart(self):
         """重启应用程序"""
         self.stop()
-        time.sleep(1)  # 等待资源释放
+        self.core.wait_stopped(timeout=5.0)  # 等待资源释放
         return self.start()
 
+def _read_config_value_getter():
+    """直接读取配置文件，返回配置项读取函数
+    
+    不创建 ConfigManager，供 --version 快速路径使用
+    
+    Returns:
+        callable: 形如 dict.get 的读取函数，文件缺失或无效时返回空配置的读取函数
+    """
+    config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        config = {}
+    return config.get if isinstance(config, dict) else {}.get
+
+def print_version(config_get=None):
+    """显示版本信息
+    
+    所有 --version 路径共用此函数，保证输出一致
+    
+    Args:
+        config_get: 配置项读取函数，为None时直接读取配置文件，不创建核心服务
+    """
+    from core.utils import get_platform_info
+    
+    if config_get is None:
+        config_get = _read_config_value_getter()
+    version = config_get("app.version", "0.1.0")
+    build_date = config_get("app.build_date", "未知")
+    
+    platform_info = get_platform_info()
+    print(f"EdgePlugHub v{version} (构建日期: {build_date})")
+    print(f"运行平台: {platform_info['system']} {platform_info['release']}")
+    print(f"Python版本: {platform_info['python_version']}")
+
+def handle_version_only(argv=None):
+    """仅查询版本时直接输出版本信息，跳过参数解析和核心初始化
+    
+    Args:
+        argv: 命令行参数列表（不含程序名），默认使用sys.argv[1:]
+        
+    Returns:
+        bool: 是否已处理（调用方应直接退出）
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv != ["--version"]:
+        return False
+    print_version()
+    return True
+
 # 用于直接运行的入口点
 def main():
+    # 仅查询版本时跳过参数解析和核心初始化
+    if handle_version_only():
+        return 0
+    
     app = EdgePlugHubApp()
     try:
         app.start()
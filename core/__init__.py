@@ -3,14 +3,25 @@
 
 """
 EdgePlugHub核心模块
+
+子模块按需延迟导入（PEP 562），避免 --version 等短命令加载全部子系统
 """
 
-from .config import ConfigManager
-from .events import EventSystem
-from .exceptions import EdgePlugHubException, ConfigError, PluginError
-from .logging_manager import LoggingManager
-from .threading import ThreadManager
-from .utils import get_platform_info, create_unique_id, compute_file_hash
+import importlib
+
+# 导出名称 -> 所在子模块
+_LAZY = {
+    'ConfigManager': '.config',
+    'EventSystem': '.events',
+    'EdgePlugHubException': '.exceptions',
+    'ConfigError': '.exceptions',
+    'PluginError': '.exceptions',
+    'LoggingManager': '.logging_manager',
+    'ThreadManager': '.threading',
+    'get_platform_info': '.utils',
+    'create_unique_id': '.utils',
+    'compute_file_hash': '.utils'
+}
 
 __all__ = [
     'ConfigManager',
@@ -24,3 +35,16 @@ __all__ = [
     'create_unique_id',
     'compute_file_hash'
 ]
+
+def __getattr__(name):
+    """首次访问导出名称时导入对应子模块"""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # 缓存到模块命名空间，后续访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
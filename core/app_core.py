@@ -19,6 +19,9 @@ from .logging_manager import LoggingManager
 from .threading import ThreadManager
 from .exceptions import ConfigError
 
+from data.repository import Repository
+from plugins.manager import PluginManager
+
 class AppCore:
     """应用程序核心类
     
@@ -37,12 +40,12 @@ class AppCore:
         self.app_dir = app_dir
         
         # 创建必要的目录
-        self.data_dir = os.path.join(app_dir, "data")
-        self.logs_dir = os.path.join(app_dir, "logs")
-        self.plugins_dir = os.path.join(app_dir, "plugins_data")
-        os.makedirs(self.data_dir, exist_ok=True)
-        os.makedirs(self.logs_dir, exist_ok=True)
-        os.makedirs(self.plugins_dir, exist_ok=True)
+        join = os.path.join
+        self.data_dir = join(app_dir, "data")
+        self.logs_dir = join(app_dir, "logs")
+        self.plugins_dir = join(app_dir, "plugins_data")
+        for directory in (self.data_dir, self.logs_dir, self.plugins_dir):
+            os.makedirs(directory, exist_ok=True)
         
         # 配置日志
         self.logging_manager = LoggingManager(
@@ -63,12 +66,15 @@ class AppCore:
             "threading.max_threads": 4
         })
         
+        # 预先解析常用的配置项，避免重复查询
+        self._refresh_config_cache()
+        
         # 初始化事件系统
-        self.event_system = EventSystem()
+        self.event_system = EventSystem(async_workers=max(2, self._cfg_max_threads // 2))
+        self.config.event_system = self.event_system
         
         # 初始化线程管理器
-        max_threads = self.config.get("threading.max_threads", 4)
-        self.thread_manager = ThreadManager(max_threads)
+        self.thread_manager = ThreadManager(self._cfg_max_threads)
         
         # 数据仓库和插件管理器会在启动过程中初始化
         self.repository = None
@@ -77,6 +83,10 @@ class AppCore:
         # 应用程序状态
         self.running = False
         self.exit_event = threading.Event()
+        # 核心服务完全停止后置位，供重启等流程等待
+        self.stopped_event = threading.Event()
+        self.stopped_event.set()
+        self._start_monotonic = time.monotonic()
         
         self.logger.info(f"{app_name} 核心服务初始化完成")
     
@@ -89,30 +99,30 @@ class AppCore:
         try:
             self.logger.info(f"正在启动 {self.app_name} 核心服务")
             
-            # 加载配置
-            if not self.config.load():
-                self.logger.warning("无法加载配置文件，将使用默认配置")
-            
             # 初始化数据仓库
             if self.repository is None:
-                from data.repository import Repository
                 self.repository = Repository(self)
                 self.repository.initialize()
                 self.logger.info("数据仓库初始化成功")
             
             # 初始化插件管理器
             if self.plugin_manager is None:
-                from plugins.manager import PluginManager
                 self.plugin_manager = PluginManager(self)
                 self.plugin_manager.initialize()
                 self.logger.info("插件管理器初始化成功")
             
             # 注册基本事件处理
             self.event_system.subscribe("app.exit", self._on_app_exit)
+            self.event_system.subscribe("config.changed", self._on_config_changed)
+            
+            # 记录启动时间并刷新配置缓存，供状态查询使用
+            self._start_monotonic = time.monotonic()
+            self._refresh_config_cache()
             
             # 标记为运行状态
             self.running = True
             self.exit_event.clear()
+            self.stopped_event.clear()
             
             # 发布应用启动事件
             self.event_system.publish("app.started", {
@@ -156,6 +166,7 @@ class AppCore:
             
             # 等待线程池完成
             self.thread_manager.wait_for_finished(5000)  # 等待最多5秒
+            self.thread_manager.shutdown(1000)
             
             # 关闭数据仓库
             if self.repository:
@@ -179,12 +190,25 @@ class AppCore:
             
         except Exception as e:
             self.logger.error(f"停止 {self.app_name} 核心服务失败: {str(e)}", exc_info=True)
+        finally:
+            self.stopped_event.set()
+    
+    def wait_stopped(self, timeout=None):
+        """等待核心服务完全停止
+        
+        Args:
+            timeout: 超时时间（秒），默认不限制
+            
+        Returns:
+            bool: 是否已停止
+        """
+        return self.stopped_event.wait(timeout)
     
     def restart(self):
         """重启应用程序核心服务"""
         self.logger.info(f"正在重启 {self.app_name} 核心服务")
         self.stop()
-        time.sleep(1)  # 等待资源释放
+        self.wait_stopped(timeout=5.0)  # 等待资源释放
         return self.start()
     
     def get_status(self) -> Dict[str, Any]:
@@ -196,11 +220,20 @@ class AppCore:
         return {
             "app_name": self.app_name,
             "running": self.running,
-            "version": self.config.get("app.version", "0.1.0"),
-            "uptime": time.time() - self.config.get("app.start_time", time.time()) if self.running else 0,
-            "thread_count": self.thread_manager.thread_pool.activeThreadCount()
+            "version": self._cfg_version,
+            "uptime": time.monotonic() - self._start_monotonic if self.running else 0,
+            "thread_count": self.thread_manager.active_count
         }
     
+    def _refresh_config_cache(self):
+        """重新读取缓存的常用配置项"""
+        self._cfg_version = self.config.get("app.version", "0.1.0")
+        self._cfg_max_threads = self.config.get("threading.max_threads", 4)
+    
+    def _on_config_changed(self, data):
+        """配置变更事件处理，刷新缓存的配置项"""
+        self._refresh_config_cache()
+    
     def _on_app_exit(self, data):
         """应用程序退出事件处理"""
         exit_code = data.get("exit_code", 0) if isinstance(data, dict) else 0
@@ -219,11 +252,8 @@ class AppCore:
             on_error: 错误回调
             on_finished: 完成回调
             **kwargs: 函数关键字参数
-            
-        Returns:
-            Worker: 工作线程对象
         """
-        return self.thread_manager.run_task(
+        self.thread_manager.run_task(
             task, *args,
             on_result=on_result,
             on_error=on_error,
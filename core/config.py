@@ -9,9 +9,31 @@
 
 import os
 import json
+import mmap
 import logging
 import threading
 
+# orjson为可选依赖，直接解析字节数据，速度明显快于标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 超过该大小（字节）的配置文件通过内存映射解析
+_MMAP_THRESHOLD = 1024 * 1024
+
+def _loads(data):
+    """将JSON字节数据解析为Python对象"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj):
+    """将Python对象序列化为带缩进的UTF-8 JSON字节数据"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
 class ConfigManager:
     """配置管理类"""
     
@@ -23,7 +45,11 @@ class ConfigManager:
         """
         self.logger = logging.getLogger('core.config')
         self._config = {}
-        self._lock = threading.RLock()
+        self._get = self._config.get  # 缓存绑定方法，读取路径无需加锁
+        self._dirty = False  # 内存中的配置是否有未保存的修改
+        self._lock = threading.Lock()
+        # 由宿主在事件系统就绪后注入，用于发布config.changed事件
+        self.event_system = None
         
         # 设置配置文件路径
         if config_file is None:
@@ -36,8 +62,8 @@ class ConfigManager:
         # 确保配置目录存在
         os.makedirs(self._config_dir, exist_ok=True)
         
-        # 加载配置
-        self._load()
+        # 加载配置（只在构造时读取一次文件）
+        self.load()
         
         # 设置默认配置
         self._set_defaults()
@@ -59,6 +85,7 @@ class ConfigManager:
         for key, value in defaults.items():
             if key not in self._config:
                 self._config[key] = value
+                self._dirty = True
     
     def set_defaults(self, defaults):
         """设置默认配置值
@@ -75,6 +102,7 @@ class ConfigManager:
                 for key, value in defaults.items():
                     if key not in self._config:
                         self._config[key] = value
+                        self._dirty = True
                         
                 self.logger.debug("已设置默认配置值")
                 return True
@@ -82,39 +110,59 @@ class ConfigManager:
             self.logger.error(f"设置默认配置值失败: {str(e)}", exc_info=True)
             return False
     
-    def _load(self):
-        """从文件加载配置"""
-        with self._lock:
-            try:
-                if os.path.exists(self._config_file):
-                    with open(self._config_file, 'r', encoding='utf-8') as f:
-                        self.logger.info(f"正在从 {self._config_file} 加载配置")
-                        self._config = json.load(f)
-                        self.logger.info("配置加载成功")
-                else:
-                    self.logger.info(f"配置文件 {self._config_file} 不存在，将使用默认配置")
-            except Exception as e:
-                self.logger.error(f"加载配置失败: {str(e)}", exc_info=True)
-                self._config = {}
+    def _replace_config(self, config):
+        """替换整个配置字典，并同步更新缓存的读取方法
+        
+        Args:
+            config: 新的配置字典
+        """
+        self._config = config
+        self._get = config.get
+        self._dirty = False
+    
+    def _read_config_file(self):
+        """一次性读取配置文件字节并解析
+        
+        Returns:
+            dict: 配置字典
+        """
+        with open(self._config_file, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if orjson is None or size <= _MMAP_THRESHOLD:
+                return _loads(f.read())
+            
+            # 大文件使用内存映射，由系统按需换页，避免整文件复制到堆上
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
     
     def save(self):
-        """保存配置到文件"""
+        """保存配置到文件
+        
+        配置自上次加载或保存后没有修改时直接返回
+        
+        Returns:
+            bool: 是否保存成功
+        """
         with self._lock:
+            if not self._dirty:
+                return True
+            
             try:
                 # 确保配置目录存在
                 os.makedirs(self._config_dir, exist_ok=True)
                 
                 # 先写入临时文件，再重命名，避免写入过程中崩溃导致文件损坏
                 temp_file = f"{self._config_file}.tmp"
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(self._config, f, ensure_ascii=False, indent=2)
+                with open(temp_file, 'wb') as f:
+                    f.write(_dumps(self._config))
+                    f.flush()
+                    os.fsync(f.fileno())
                 
-                # 替换原文件
-                if os.path.exists(self._config_file):
-                    os.replace(temp_file, self._config_file)
-                else:
-                    os.rename(temp_file, self._config_file)
-                    
+                # 替换原文件（目标存在与否均为原子操作）
+                os.replace(temp_file, self._config_file)
+                
+                self._dirty = False
                 self.logger.info(f"配置已保存到 {self._config_file}")
                 return True
             except Exception as e:
@@ -131,8 +179,8 @@ class ConfigManager:
         Returns:
             配置值，如果键不存在则返回默认值
         """
-        with self._lock:
-            return self._config.get(key, default)
+        # dict.get在GIL下是原子操作，读取无需加锁
+        return self._get(key, default)
     
     def set(self, key, value):
         """设置配置值
@@ -147,13 +195,19 @@ class ConfigManager:
         with self._lock:
             try:
                 old_value = self._config.get(key)
-                if old_value != value:
+                changed = old_value != value
+                if changed:
                     self._config[key] = value
-                    self.logger.debug(f"配置已更新: {key} = {value}")
-                return True
+                    self._dirty = True
+                    self.logger.debug("配置已更新: %s = %s", key, value)
             except Exception as e:
                 self.logger.error(f"设置配置失败: {str(e)}", exc_info=True)
                 return False
+        
+        # 在锁外通知订阅者，避免回调中读写配置时死锁
+        if changed:
+            self._notify_changed({"key": key, "value": value, "old_value": old_value})
+        return True
     
     def delete(self, key):
         """删除配置项
@@ -165,11 +219,14 @@ class ConfigManager:
             bool: 是否成功删除
         """
         with self._lock:
-            if key in self._config:
-                del self._config[key]
-                self.logger.debug(f"配置已删除: {key}")
-                return True
-            return False
+            if key not in self._config:
+                return False
+            old_value = self._config.pop(key)
+            self._dirty = True
+            self.logger.debug("配置已删除: %s", key)
+        
+        self._notify_changed({"key": key, "value": None, "old_value": old_value})
+        return True
     
     def get_all(self):
         """获取所有配置
@@ -177,16 +234,29 @@ class ConfigManager:
         Returns:
             dict: 配置字典的副本
         """
-        with self._lock:
-            return dict(self._config)
+        return dict(self._config)
     
     def reset(self):
         """重置配置到默认值"""
         with self._lock:
             self._config.clear()
+            self._dirty = True
             self._set_defaults()
-            self.save()
-            self.logger.info("配置已重置为默认值")
+        
+        # save自行加锁，需在锁外调用
+        self.save()
+        self.logger.info("配置已重置为默认值")
+        self._notify_changed({"key": None, "reset": True})
+    
+    def _notify_changed(self, data):
+        """发布config.changed事件
+        
+        Args:
+            data: 事件数据，key为None表示整体重置
+        """
+        event_system = self.event_system
+        if event_system is not None:
+            event_system.publish("config.changed", data)
     
     def get_config_file(self):
         """获取配置文件路径"""
@@ -201,15 +271,14 @@ class ConfigManager:
         with self._lock:
             try:
                 if os.path.exists(self._config_file):
-                    with open(self._config_file, 'r', encoding='utf-8') as f:
-                        self.logger.info(f"正在从 {self._config_file} 加载配置")
-                        self._config = json.load(f)
-                        self.logger.info("配置加载成功")
+                    self.logger.info(f"正在从 {self._config_file} 加载配置")
+                    self._replace_config(self._read_config_file())
+                    self.logger.info("配置加载成功")
                     return True
                 else:
                     self.logger.info(f"配置文件 {self._config_file} 不存在，将使用默认配置")
                     return False
             except Exception as e:
                 self.logger.error(f"加载配置失败: {str(e)}", exc_info=True)
-                self._config = {}
+                self._replace_config({})
                 return False 
\ No newline at end of file
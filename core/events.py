@@ -11,25 +11,64 @@
 import logging
 import threading
 import time
-import queue
-import uuid
-from PyQt5.QtCore import QObject, QTimer, Qt
+import itertools
+from collections import deque
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+class _AsyncShard:
+    """异步事件分片
+    
+    每个分片由一个处理线程独占，同一事件类型总是落在同一分片，保证按顺序处理
+    """
+    
+    def __init__(self):
+        self.events = deque()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()  # 有新事件入队
+        self.idle = threading.Event()    # 队列已全部处理完
+        self.idle.set()
+        self.thread = None
+    
+    def put(self, item):
+        """事件入队并唤醒处理线程"""
+        with self.lock:
+            self.events.append(item)
+            self.idle.clear()
+            self.wakeup.set()
 
 class EventSystem(QObject):
     """事件系统类，实现发布-订阅模式"""
     
-    def __init__(self):
-        """初始化事件系统"""
+    # 通知主线程处理待执行回调的信号（跨线程排队投递）
+    _main_thread_dispatch = pyqtSignal()
+    
+    def __init__(self, async_workers=2):
+        """初始化事件系统
+        
+        Args:
+            async_workers: 异步事件处理线程数
+        """
         super().__init__()
-        self._subscribers = {}  # 事件类型 -> [回调函数列表]
-        self._subscribers_lock = threading.RLock()  # 防止并发修改订阅者列表
+        
+        # 待在主线程执行的回调，由一次排队信号整批处理
+        self._main_thread_calls = deque()
+        self._main_thread_lock = threading.Lock()
+        self._main_thread_dispatch.connect(self._drain_main_thread_queue, Qt.QueuedConnection)
+        # 事件类型 -> ((订阅者ID, 回调函数), ...)
+        # 写时复制：订阅/取消订阅时整体替换字典，发布时无需加锁
+        self._subscribers = {}
+        self._subscribers_lock = threading.Lock()  # 串行化订阅者的修改
         self.logger = logging.getLogger('core.events')
+        self._main_thread = threading.main_thread()
+        self._subscriber_ids = itertools.count(1)  # 进程内自增的订阅者ID
         
         # 添加异步事件处理支持
-        self._async_queue = queue.Queue()
-        self._async_thread = threading.Thread(target=self._process_async_events, daemon=True)
-        self._async_thread.start()
+        # 按事件类型分片到多个处理线程，处理线程每次唤醒后整批取出
         self._running = True
+        self._async_shards = tuple(_AsyncShard() for _ in range(max(1, async_workers)))
+        for shard in self._async_shards:
+            shard.thread = threading.Thread(target=self._process_async_events, args=(shard,), daemon=True)
+            shard.thread.start()
     
     def subscribe(self, event_type, callback, subscriber_id=None):
         """订阅事件
@@ -40,18 +79,17 @@ class EventSystem(QObject):
             subscriber_id: 订阅者ID，默认自动生成
             
         Returns:
-            str: 订阅者ID，可用于取消订阅
+            订阅者ID，可用于取消订阅；自动生成的ID为整数
         """
         if subscriber_id is None:
-            subscriber_id = str(uuid.uuid4())
+            subscriber_id = next(self._subscriber_ids)
             
         with self._subscribers_lock:
-            if event_type not in self._subscribers:
-                self._subscribers[event_type] = []
-            
-            self._subscribers[event_type].append((subscriber_id, callback))
+            subscribers = dict(self._subscribers)
+            subscribers[event_type] = subscribers.get(event_type, ()) + ((subscriber_id, callback),)
+            self._subscribers = subscribers
             
-        self.logger.debug(f"已订阅事件: {event_type}, 订阅者ID: {subscriber_id}")
+        self.logger.debug("已订阅事件: %s, 订阅者ID: %s", event_type, subscriber_id)
         return subscriber_id
     
     def unsubscribe(self, event_type, subscriber_id):
@@ -68,24 +106,25 @@ class EventSystem(QObject):
             if event_type not in self._subscribers:
                 return False
             
-            # 过滤掉指定ID的订阅者
-            original_count = len(self._subscribers[event_type])
-            self._subscribers[event_type] = [
-                (sid, callback) 
-                for sid, callback in self._subscribers[event_type] 
-                if sid != subscriber_id
-            ]
+            # 查找指定ID的订阅者
+            current = self._subscribers[event_type]
+            index = next((i for i, (sid, _) in enumerate(current) if sid == subscriber_id), None)
+            success = index is not None
             
-            # 如果没有订阅者了，删除整个事件类型
-            if not self._subscribers[event_type]:
-                del self._subscribers[event_type]
-                
-            success = len(self._subscribers.get(event_type, [])) < original_count
+            if success:
+                subscribers = dict(self._subscribers)
+                if len(current) > 1:
+                    # 保持其余订阅者的注册顺序，事件仍按订阅先后投递
+                    subscribers[event_type] = current[:index] + current[index + 1:]
+                else:
+                    # 如果没有订阅者了，删除整个事件类型
+                    del subscribers[event_type]
+                self._subscribers = subscribers
             
             if success:
-                self.logger.debug(f"已取消订阅: {event_type}, 订阅者ID: {subscriber_id}")
+                self.logger.debug("已取消订阅: %s, 订阅者ID: %s", event_type, subscriber_id)
             else:
-                self.logger.warning(f"未找到订阅: {event_type}, 订阅者ID: {subscriber_id}")
+                self.logger.warning("未找到订阅: %s, 订阅者ID: %s", event_type, subscriber_id)
                 
             return success
     
@@ -97,23 +136,29 @@ class EventSystem(QObject):
             data: 事件数据
             main_thread: 是否在主线程中执行回调
         """
-        self.logger.debug(f"发布事件: {event_type}, 主线程回调: {main_thread}")
+        # 订阅者元组不可变，回调中修改订阅不会影响本次遍历
+        # 没有订阅者时（常见于生命周期事件）直接返回
+        subscribers = self._subscribers.get(event_type)
+        if not subscribers:
+            return
         
-        with self._subscribers_lock:
-            if event_type not in self._subscribers:
-                return
-            
-            # 复制订阅者列表，防止回调中修改订阅
-            subscribers = list(self._subscribers[event_type])
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("发布事件: %s, 主线程回调: %s", event_type, main_thread)
         
-        # 调用所有回调函数
+        # 同一次发布的所有回调所在线程相同，只判断一次
+        if main_thread and threading.current_thread() is not self._main_thread:
+            # 在主线程中执行回调
+            dispatch = self._execute_in_main_thread
+            for subscriber_id, callback in subscribers:
+                dispatch(callback, data, event_type, subscriber_id)
+            return
+        
+        # 在当前线程执行回调，内联_execute_callback以减少每个订阅者一次的方法调用
         for subscriber_id, callback in subscribers:
-            if main_thread and threading.current_thread() is not threading.main_thread():
-                # 在主线程中执行回调
-                self._execute_in_main_thread(callback, data, event_type, subscriber_id)
-            else:
-                # 在当前线程执行回调
-                self._execute_callback(callback, data, event_type, subscriber_id)
+            try:
+                callback(data)
+            except Exception as e:
+                self.logger.error(f"事件处理器异常 ({event_type}, {subscriber_id}): {str(e)}", exc_info=True)
     
     def publish_async(self, event_type, data=None, main_thread=False):
         """异步发布事件
@@ -123,8 +168,14 @@ class EventSystem(QObject):
             data: 事件数据
             main_thread: 是否在主线程中执行回调
         """
-        self.logger.debug(f"异步发布事件: {event_type}, 主线程回调: {main_thread}")
-        self._async_queue.put((event_type, data, main_thread))
+        # 当前没有订阅者的事件不入队
+        if event_type not in self._subscribers:
+            return
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("异步发布事件: %s, 主线程回调: %s", event_type, main_thread)
+        shards = self._async_shards
+        shards[hash(event_type) % len(shards)].put((event_type, data, main_thread))
     
     def _execute_callback(self, callback, data, event_type, subscriber_id):
         """执行回调函数
@@ -149,50 +200,80 @@ class EventSystem(QObject):
             event_type: 事件类型
             subscriber_id: 订阅者ID
         """
-        # 使用QTimer.singleShot在主线程中执行回调
-        QTimer.singleShot(0, lambda: self._execute_callback(callback, data, event_type, subscriber_id))
+        with self._main_thread_lock:
+            # 队列为空时才需要发信号，否则已有一次处理在排队中
+            schedule = not self._main_thread_calls
+            self._main_thread_calls.append((callback, data, event_type, subscriber_id))
+        
+        if schedule:
+            self._main_thread_dispatch.emit()
+    
+    def _drain_main_thread_queue(self):
+        """在主线程中执行所有排队的回调"""
+        with self._main_thread_lock:
+            batch, self._main_thread_calls = self._main_thread_calls, deque()
+        
+        for callback, data, event_type, subscriber_id in batch:
+            self._execute_callback(callback, data, event_type, subscriber_id)
     
-    def _process_async_events(self):
-        """异步事件处理线程"""
+    def _process_async_events(self, shard):
+        """异步事件处理线程
+        
+        Args:
+            shard: 本线程负责的事件分片
+        """
         self.logger.info("异步事件处理线程已启动")
         
         while self._running:
-            try:
-                # 获取队列中的事件（阻塞，但有超时以便检查_running状态）
-                try:
-                    event_type, data, main_thread = self._async_queue.get(timeout=0.5)
-                except queue.Empty:
-                    continue
-                
-                # 处理事件
+            # 阻塞等待新事件或关闭信号
+            shard.wakeup.wait()
+            
+            # 整批取出队列中的事件，每批只加锁一次
+            with shard.lock:
+                batch, shard.events = shard.events, deque()
+                shard.wakeup.clear()
+            
+            # 处理事件
+            for event_type, data, main_thread in batch:
                 try:
                     self.publish(event_type, data, main_thread)
-                finally:
-                    # 标记任务完成
-                    self._async_queue.task_done()
-                    
-            except Exception as e:
-                self.logger.error(f"异步事件处理错误: {str(e)}", exc_info=True)
+                except Exception as e:
+                    self.logger.error(f"异步事件处理错误: {str(e)}", exc_info=True)
+            
+            # 处理期间没有新事件入队，则标记为空闲
+            with shard.lock:
+                if not shard.events:
+                    shard.idle.set()
     
     def shutdown(self):
         """关闭事件系统"""
         self.logger.info("正在关闭事件系统...")
         self._running = False
+        for shard in self._async_shards:
+            shard.wakeup.set()
         
         # 等待异步线程结束
-        if self._async_thread.is_alive():
-            self._async_thread.join(timeout=2.0)
+        for shard in self._async_shards:
+            if shard.thread.is_alive():
+                shard.thread.join(timeout=2.0)
             
         # 清空订阅者
         with self._subscribers_lock:
-            self._subscribers.clear()
+            self._subscribers = {}
             
         self.logger.info("事件系统已关闭")
         
-    def flush(self):
-        """等待所有异步事件处理完成"""
+    def flush(self, timeout=None):
+        """等待所有异步事件处理完成
+        
+        Args:
+            timeout: 超时时间（秒），默认不限制
+        """
         try:
-            self._async_queue.join()
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for shard in self._async_shards:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                shard.idle.wait(remaining)
             self.logger.debug("所有异步事件已处理完成")
         except Exception as e:
             self.logger.error(f"等待异步事件处理时出错: {str(e)}", exc_info=True) 
\ No newline at end of file
@@ -96,4 +96,4 @@ class ValidationError(EdgePlugHubException):
     def __init__(self, message="验证错误", code=None, field=None):
         self.field = field
         message_with_field = f"{message} [字段: {field}]" if field else message
-        super().__init__(message_with_field, code) 
\ No newline at end of file
+        super().__init__(message_with_field, code)
@@ -9,15 +9,152 @@
 
 import os
 import sys
+import gzip
+import time
+import shutil
+import atexit
+import queue
 import logging
+import logging.handlers
+import threading
 import datetime
 import traceback
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# 日志级别名称 -> 日志级别常量
+_LEVEL_MAP = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL
+}
+
+# 日志格式中不使用线程和进程信息，创建记录时无需采集
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+class _CachedTimeFormatter(logging.Formatter):
+    """缓存时间字符串的格式化器
+    
+    同一秒内的记录复用strftime的结果，只拼接毫秒部分
+    """
+    
+    def __init__(self, fmt=None):
+        super().__init__(fmt)
+        self._time_cache = (None, '')  # (秒, 格式化后的时间)
+    
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        
+        sec = int(record.created)
+        cache = self._time_cache
+        if cache[0] != sec:
+            cache = (sec, time.strftime(self.default_time_format, self.converter(sec)))
+            self._time_cache = cache
+        return self.default_msec_format % (cache[1], record.msecs)
+
+class _BufferedFileHandler(logging.FileHandler):
+    """带写缓冲的文件处理器
+    
+    普通记录只写入64 KiB缓冲区，由定时刷新或ERROR及以上级别的记录落盘，
+    避免每条日志一次write系统调用
+    """
+    
+    buffer_size = 64 * 1024
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+def _compress_log_file(path):
+    """将日志文件压缩为.gz并删除原文件
+    
+    Args:
+        path: 日志文件路径
+    """
+    try:
+        with open(path, 'rb') as src, gzip.open(f"{path}.gz", 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(path)
+    except OSError as e:
+        print(f"压缩日志文件失败: {str(e)}", file=sys.stderr)
+
+class _DailyFileHandler(_BufferedFileHandler):
+    """按日期命名的日志文件处理器
+    
+    写入app_YYYYMMDD.log，跨过零点时切换到新日期的文件，
+    旧文件在单独的线程中压缩，不阻塞日志输出
+    """
+    
+    def __init__(self, log_dir, encoding=None):
+        """初始化文件处理器
+        
+        Args:
+            log_dir: 日志目录
+            encoding: 文件编码
+        """
+        self.log_dir = log_dir
+        self._compressor = None
+        super().__init__(self._current_log_file(), encoding=encoding)
+        self._rollover_at = self._next_rollover_time()
+    
+    def _current_log_file(self):
+        """当天的日志文件路径"""
+        return os.path.join(self.log_dir, f"app_{datetime.datetime.now().strftime('%Y%m%d')}.log")
+    
+    @staticmethod
+    def _next_rollover_time():
+        """下一个零点的时间戳"""
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        return datetime.datetime.combine(tomorrow, datetime.time()).timestamp()
+    
+    def _rollover(self):
+        """切换到当天的日志文件，并在后台压缩旧文件"""
+        old_file = self.baseFilename
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        
+        self.baseFilename = os.path.abspath(self._current_log_file())
+        self._rollover_at = self._next_rollover_time()
+        
+        if old_file != self.baseFilename and os.path.exists(old_file):
+            if self._compressor is None:
+                self._compressor = ThreadPoolExecutor(max_workers=1)
+            self._compressor.submit(_compress_log_file, old_file)
+    
+    def emit(self, record):
+        if time.time() >= self._rollover_at:
+            self._rollover()
+        super().emit(record)
+    
+    def close(self):
+        super().close()
+        if self._compressor is not None:
+            self._compressor.shutdown(wait=True)
+            self._compressor = None
 
 class LoggingManager:
     """日志管理类
     
     管理应用程序的日志系统，提供统一的日志记录接口
+    
+    各日志记录器只挂载一个QueueHandler，实际的控制台和文件输出由
+    QueueListener在后台线程中完成，调用方线程不执行I/O
     """
     
     def __init__(self, log_level="INFO", log_dir=None, console_output=True):
@@ -36,6 +173,27 @@ class LoggingManager:
         if self.log_dir:
             os.makedirs(self.log_dir, exist_ok=True)
         
+        # 写入日志文件的记录器名称（根日志记录器只输出到控制台）
+        self._file_logger_names = set()
+        
+        # 所有输出处理器共用的格式化器
+        self._formatter = _CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        
+        # 日志队列及后台输出线程
+        self._log_queue = queue.SimpleQueue()
+        self._queue_handler = logging.handlers.QueueHandler(self._log_queue)
+        self._handlers = self._create_handlers()
+        self._listener = logging.handlers.QueueListener(
+            self._log_queue, *self._handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self.shutdown)
+        
+        # 定时刷新文件缓冲区，保证低频日志也能及时写入
+        self._flush_stop = threading.Event()
+        self._flush_thread = threading.Thread(target=self._periodic_flush, daemon=True)
+        self._flush_thread.start()
+        
         # 配置根日志记录器
         self._setup_root_logger()
         
@@ -45,7 +203,8 @@ class LoggingManager:
         
         self.logger.info("日志系统初始化完成")
     
-    def _get_log_level(self, level):
+    @staticmethod
+    def _get_log_level(level):
         """转换日志级别字符串为常量
         
         Args:
@@ -54,72 +213,108 @@ class LoggingManager:
         Returns:
             int: 日志级别常量
         """
-        level_map = {
-            "DEBUG": logging.DEBUG,
-            "INFO": logging.INFO,
-            "WARNING": logging.WARNING,
-            "ERROR": logging.ERROR,
-            "CRITICAL": logging.CRITICAL
-        }
-        
         if isinstance(level, str):
-            return level_map.get(level.upper(), logging.INFO)
+            return _LEVEL_MAP.get(level.upper(), logging.INFO)
         return level
     
-    def _setup_root_logger(self):
-        """配置根日志记录器"""
-        root_logger = logging.getLogger()
-        root_logger.setLevel(logging.INFO)
+    def _create_handlers(self):
+        """创建由后台线程使用的输出处理器
         
-        # 清除现有处理器
-        for handler in root_logger.handlers[:]:
-            root_logger.removeHandler(handler)
+        Returns:
+            list: 日志处理器列表
+        """
+        handlers = []
+        formatter = self._formatter
         
         # 添加控制台处理器
         if self.console_output:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(self.log_level)
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
             console_handler.setFormatter(formatter)
-            root_logger.addHandler(console_handler)
+            handlers.append(console_handler)
+        
+        # 添加文件处理器
+        if self.log_dir:
+            try:
+                file_handler = _DailyFileHandler(self.log_dir, encoding='utf-8')
+                file_handler.setLevel(self.log_level)
+                file_handler.setFormatter(formatter)
+                file_handler.addFilter(self._is_file_record)
+                handlers.append(file_handler)
+            except Exception as e:
+                print(f"无法创建日志文件: {str(e)}")
+        
+        return handlers
     
-    def _setup_logger(self, logger, level):
-        """配置指定的日志记录器
+    def _periodic_flush(self, interval=1.0):
+        """定时刷新处理器缓冲区
+        
+        Args:
+            interval: 刷新间隔（秒）
+        """
+        while not self._flush_stop.wait(interval):
+            for handler in self._handlers:
+                handler.flush()
+    
+    def _is_file_record(self, record):
+        """判断日志记录是否应写入日志文件
+        
+        已配置的日志记录器及其子记录器（经传播到达）的记录都写入文件
+        """
+        names = self._file_logger_names
+        name = record.name
+        while name:
+            if name in names:
+                return True
+            name = name.rpartition('.')[0]
+        return False
+    
+    def _attach_queue_handler(self, logger):
+        """将日志记录器的处理器替换为队列处理器
         
         Args:
             logger: 日志记录器
-            level: 日志级别
+            
+        Returns:
+            bool: 是否进行了配置，已配置过则返回False
         """
-        logger.setLevel(level)
-        logger.propagate = False  # 避免日志消息传播到根日志记录器
+        if self._queue_handler in logger.handlers:
+            return False
         
         # 清除现有处理器
         for handler in logger.handlers[:]:
             logger.removeHandler(handler)
+        logger.addHandler(self._queue_handler)
+        return True
+    
+    def _setup_root_logger(self):
+        """配置根日志记录器"""
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.INFO)
+        self._attach_queue_handler(root_logger)
+    
+    def _setup_logger(self, logger, level):
+        """配置指定的日志记录器
         
-        # 添加控制台处理器
-        if self.console_output:
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(level)
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
+        同一日志记录器只配置一次
         
-        # 添加文件处理器
-        if self.log_dir:
-            log_file = os.path.join(self.log_dir, f"app_{datetime.datetime.now().strftime('%Y%m%d')}.log")
-            try:
-                file_handler = logging.FileHandler(log_file, encoding='utf-8')
-                file_handler.setLevel(level)
-                file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-                file_handler.setFormatter(file_formatter)
-                logger.addHandler(file_handler)
-            except Exception as e:
-                print(f"无法创建日志文件: {str(e)}")
+        Args:
+            logger: 日志记录器
+            level: 日志级别
+        """
+        if logger.name in self._file_logger_names:
+            return
+        
+        self._file_logger_names.add(logger.name)
+        self._attach_queue_handler(logger)
+        logger.setLevel(level)
+        logger.propagate = False  # 避免日志消息传播到根日志记录器
     
     def get_logger(self, name):
         """获取指定名称的日志记录器
         
+        已配置过的日志记录器直接返回，不重复配置
+        
         Args:
             name: 日志记录器名称
             
@@ -140,17 +335,25 @@ class LoggingManager:
         self.log_level = level
         
         # 更新根日志记录器
-        root_logger = logging.getLogger()
-        root_logger.setLevel(level)
-        for handler in root_logger.handlers:
-            handler.setLevel(level)
+        logging.getLogger().setLevel(level)
         
         # 更新应用日志记录器
         self.logger.setLevel(level)
-        for handler in self.logger.handlers:
+        
+        # 更新实际输出的处理器
+        for handler in self._handlers:
             handler.setLevel(level)
         
-        self.logger.info(f"日志级别已设置为: {logging.getLevelName(level)}")
+        self.logger.info("日志级别已设置为: %s", logging.getLevelName(level))
+    
+    def shutdown(self):
+        """停止后台输出线程，输出队列中剩余的日志"""
+        self._flush_stop.set()
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            for handler in self._handlers:
+                handler.close()
     
     def get_log_files(self):
         """获取日志文件列表
@@ -161,9 +364,9 @@ class LoggingManager:
         if not self.log_dir or not os.path.exists(self.log_dir):
             return []
         
-        log_files = []
-        for file in os.listdir(self.log_dir):
-            if file.endswith('.log'):
-                log_files.append(os.path.join(self.log_dir, file))
-        
-        return log_files 
\ No newline at end of file
+        # scandir的目录项自带文件类型，无需逐个stat或拼接路径
+        with os.scandir(self.log_dir) as entries:
+            return [
+                entry.path for entry in entries
+                if entry.name.endswith('.log') and entry.is_file(follow_symlinks=False)
+            ] 
\ No newline at end of file
@@ -7,54 +7,123 @@
 提供线程安全的任务执行和线程管理功能
 """
 
+import asyncio
+import atexit
 import logging
+import queue
+import threading
 import traceback
-from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool
+import weakref
+from collections import deque
+from PyQt5.QtCore import QObject, Qt, pyqtSignal, QRunnable, QThreadPool
 
-class WorkerSignals(QObject):
-    """工作线程信号
+# 已启动常驻工作线程的线程管理器，进程退出时统一停止
+_live_managers = weakref.WeakSet()
+
+@atexit.register
+def _shutdown_live_managers():
+    """进程退出时停止所有常驻工作线程
     
-    提供线程完成、错误和结果的信号
+    常驻线程阻塞在任务队列上，QThreadPool析构时会等待其退出；
+    未显式调用shutdown()的进程若不在此发送结束标记，退出时将永远挂起
     """
-    result = pyqtSignal(object)
-    error = pyqtSignal(str, object)  # 错误消息和详细信息
-    finished = pyqtSignal()
+    for manager in list(_live_managers):
+        manager.shutdown()
+
+def _resolve_future(future, result=None, exception=None):
+    """在事件循环线程中设置Future的结果，已取消的Future忽略"""
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
 
-class Worker(QRunnable):
-    """工作线程
+class _CallbackDispatcher(QObject):
+    """回调分发器
     
-    在QThreadPool中执行的可运行任务
+    在创建者线程（通常为主线程）中整批执行工作线程提交的回调，
+    所有任务共用一个实例，避免每个任务创建一个信号对象
     """
     
-    def __init__(self, fn, *args, **kwargs):
+    # 通知创建者线程处理待执行回调的信号（跨线程排队投递）
+    _dispatch = pyqtSignal()
+    
+    def __init__(self):
+        super().__init__()
+        self._calls = deque()
+        self._lock = threading.Lock()
+        self._dispatch.connect(self._drain, Qt.QueuedConnection)
+    
+    def post(self, callback, *args):
+        """提交一个待执行的回调
+        
+        Args:
+            callback: 回调函数
+            *args: 回调参数
+        """
+        with self._lock:
+            # 队列为空时才需要发信号，否则已有一次处理在排队中
+            schedule = not self._calls
+            self._calls.append((callback, args))
+        
+        if schedule:
+            self._dispatch.emit()
+    
+    def _drain(self):
+        """执行所有排队的回调"""
+        with self._lock:
+            batch, self._calls = self._calls, deque()
+        
+        for callback, args in batch:
+            try:
+                callback(*args)
+            except Exception as e:
+                logging.error("任务回调执行出错: %s", e, exc_info=True)
+
+class _PoolWorker(QRunnable):
+    """常驻工作线程
+    
+    在QThreadPool中长期运行，循环从共享队列中取出任务执行，直到收到结束标记
+    """
+    
+    def __init__(self, manager):
         """初始化工作线程
         
         Args:
-            fn: 要执行的函数
-            *args: 函数参数
-            **kwargs: 函数关键字参数
+            manager: 所属的线程管理器
         """
         super().__init__()
-        self.fn = fn
-        self.args = args
-        self.kwargs = kwargs
-        self.signals = WorkerSignals()
-        
+        self.setAutoDelete(False)
+        self._manager = manager
+    
     def run(self):
-        """执行任务"""
-        try:
-            # 调用函数
-            result = self.fn(*self.args, **self.kwargs)
-            # 发出结果信号
-            self.signals.result.emit(result)
-        except Exception as e:
-            # 记录错误并发出错误信号
-            logging.error(f"线程任务执行出错: {str(e)}")
-            tb = traceback.format_exc()
-            self.signals.error.emit(str(e), tb)
-        finally:
-            # 无论成功或失败，都发出完成信号
-            self.signals.finished.emit()
+        """循环执行任务"""
+        manager = self._manager
+        tasks = manager._tasks
+        post = manager._dispatcher.post
+        
+        while True:
+            item = tasks.get()
+            if item is None:
+                break
+            
+            fn, args, kwargs, on_result, on_error, on_finished = item
+            try:
+                # 调用函数
+                result = fn(*args, **kwargs)
+                if on_result is not None:
+                    post(on_result, result)
+            except Exception as e:
+                # 记录错误并投递错误回调
+                logging.error("线程任务执行出错: %s", e)
+                if on_error is not None:
+                    post(on_error, str(e), traceback.format_exc())
+            finally:
+                # 无论成功或失败，都投递完成回调
+                if on_finished is not None:
+                    post(on_finished)
+                manager._task_done()
 
 class ThreadManager:
     """线程管理器
@@ -71,7 +140,33 @@ class ThreadManager:
         self.thread_pool = QThreadPool()
         if max_threads is not None:
             self.thread_pool.setMaxThreadCount(max_threads)
-        logging.info(f"线程池初始化完成，最大线程数: {self.thread_pool.maxThreadCount()}")
+        
+        # 常驻工作线程共享的任务队列，工作线程在首次提交任务时启动
+        self._tasks = queue.SimpleQueue()
+        self._dispatcher = _CallbackDispatcher()
+        self._workers = ()
+        self._pending = 0  # 已提交但尚未完成的任务数
+        self._state_lock = threading.Condition()
+        logging.info("线程池初始化完成，最大线程数: %s", self.thread_pool.maxThreadCount())
+    
+    def _start_workers(self):
+        """启动常驻工作线程，调用方需持有_state_lock"""
+        self._workers = tuple(_PoolWorker(self) for _ in range(self.thread_pool.maxThreadCount()))
+        for worker in self._workers:
+            self.thread_pool.start(worker)
+        _live_managers.add(self)
+    
+    def _task_done(self):
+        """标记一个任务执行完毕"""
+        with self._state_lock:
+            self._pending -= 1
+            if not self._pending:
+                self._state_lock.notify_all()
+    
+    @property
+    def active_count(self):
+        """正在排队或执行的任务数"""
+        return self._pending
         
     def run_task(self, task, *args, on_result=None, on_error=None, on_finished=None, **kwargs):
         """异步运行任务
@@ -83,27 +178,55 @@ class ThreadManager:
             on_error: 错误回调函数
             on_finished: 完成回调函数
             **kwargs: 函数关键字参数
+        """
+        with self._state_lock:
+            if not self._workers:
+                self._start_workers()
+            self._pending += 1
+        
+        self._tasks.put((task, args, kwargs, on_result, on_error, on_finished))
+        
+    def run_task_async(self, task, *args, **kwargs):
+        """异步运行任务，返回可在当前事件循环中等待的Future
+        
+        结果由工作线程直接投递到事件循环，不依赖Qt事件循环
+        
+        Args:
+            task: 要执行的函数
+            *args: 函数参数
+            **kwargs: 函数关键字参数
             
         Returns:
-            Worker: 工作线程实例
+            asyncio.Future: 任务结果，任务抛出的异常会设置到Future上
         """
-        # 创建工作线程
-        worker = Worker(task, *args, **kwargs)
-        
-        # 连接信号
-        if on_result is not None:
-            worker.signals.result.connect(on_result)
-        if on_error is not None:
-            worker.signals.error.connect(on_error)
-        if on_finished is not None:
-            worker.signals.finished.connect(on_finished)
-            
-        # 启动任务
-        self.thread_pool.start(worker)
-        return worker
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def run():
+            try:
+                result = task(*args, **kwargs)
+            except Exception as e:
+                loop.call_soon_threadsafe(_resolve_future, future, None, e)
+                raise
+            loop.call_soon_threadsafe(_resolve_future, future, result)
+        
+        self.run_task(run)
+        return future
+    
+    async def join(self, timeout=None):
+        """等待所有任务完成，不阻塞事件循环
         
+        Args:
+            timeout: 超时时间（毫秒），默认不限制
+            
+        Returns:
+            bool: 是否全部完成
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.wait_for_finished, timeout)
+    
     def wait_for_finished(self, timeout=None):
-        """等待所有线程完成
+        """等待所有任务完成
         
         Args:
             timeout: 超时时间（毫秒），默认不限制
@@ -111,4 +234,27 @@ class ThreadManager:
         Returns:
             bool: 是否全部完成
         """
-        return self.thread_pool.waitForDone(timeout) 
\ No newline at end of file
+        with self._state_lock:
+            return self._state_lock.wait_for(
+                lambda: not self._pending,
+                None if timeout is None or timeout < 0 else timeout / 1000.0
+            )
+    
+    def shutdown(self, timeout=None):
+        """停止常驻工作线程
+        
+        已提交的任务会先执行完毕，之后再次提交任务时重新启动工作线程
+        
+        Args:
+            timeout: 等待线程退出的超时时间（毫秒），默认不限制
+            
+        Returns:
+            bool: 工作线程是否全部退出
+        """
+        with self._state_lock:
+            workers, self._workers = self._workers, ()
+            _live_managers.discard(self)
+        
+        for _ in workers:
+            self._tasks.put(None)
+        return self.thread_pool.waitForDone(-1 if timeout is None else timeout)
@@ -11,6 +11,7 @@ import os
 import sys
 import platform
 import hashlib
+import mmap
 import json
 import logging
 import time
@@ -18,19 +19,47 @@ import uuid
 import shutil
 import tempfile
 import zipfile
-import requests
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from functools import wraps
-from PyQt5.QtCore import QThread, pyqtSignal
+from functools import wraps, lru_cache
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+# orjson为可选依赖，解析速度明显快于标准库json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # 设置日志
 logger = logging.getLogger('core.utils')
 
-def get_platform_info():
-    """获取平台信息
+# 超过该大小（字节）的文件使用多线程预读计算哈希
+_PARALLEL_HASH_THRESHOLD = 64 << 20
+# 多线程预读时每个读取块的大小（字节）
+_HASH_CHUNK_SIZE = 4 << 20
+# 解压ZIP成员时的复制缓冲区大小（字节）
+_EXTRACT_BUFFER_SIZE = 1 << 20
+# 下载文件时每次读取和写入的块大小（字节）
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+# 下载进度回调的最小间隔（秒）
+_PROGRESS_INTERVAL = 0.05
+# 文件名中的不安全字符统一替换为下划线
+_FILENAME_TRANS = str.maketrans(dict.fromkeys('/\\:*?"<>|', '_'))
+# JSON文本可能的首字符（json模块额外接受NaN与Infinity）
+_JSON_START_CHARS = frozenset('{["tfn-0123456789NI')
+# JSON规范定义的空白字符，json模块只跳过这四种
+_JSON_WHITESPACE = ' \t\n\r'
+
+@lru_cache(maxsize=1)
+def _probe_platform_info():
+    """探测平台信息，进程内只执行一次
     
     Returns:
-        dict: 包含平台信息的字典
+        dict: 平台信息，仅供get_platform_info复制，调用方不应直接修改
     """
     return {
         'system': platform.system(),
@@ -42,38 +71,87 @@ def get_platform_info():
         'python_implementation': platform.python_implementation()
     }
 
+def get_platform_info():
+    """获取平台信息
+    
+    Returns:
+        dict: 包含平台信息的字典，每次返回缓存结果的副本，调用方可以自由修改
+    """
+    return dict(_probe_platform_info())
+
+def _hash_file_parallel(file_path, hash_obj, size):
+    """多线程预读大文件，并按顺序送入同一个哈希对象
+    
+    哈希计算本身只能顺序进行，预读线程在计算当前块时读取后续块，掩盖磁盘延迟
+    
+    Args:
+        file_path: 文件路径
+        hash_obj: hashlib哈希对象
+        size: 文件大小（字节）
+    """
+    workers = min(4, os.cpu_count() or 1)
+    offsets = iter(range(0, size, _HASH_CHUNK_SIZE))
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # 最多保持workers个块在读取中，限制内存占用
+            pending = deque(
+                executor.submit(os.pread, fd, _HASH_CHUNK_SIZE, offset)
+                for offset in itertools.islice(offsets, workers)
+            )
+            while pending:
+                chunk = pending.popleft().result()
+                offset = next(offsets, None)
+                if offset is not None:
+                    pending.append(executor.submit(os.pread, fd, _HASH_CHUNK_SIZE, offset))
+                hash_obj.update(chunk)
+    finally:
+        os.close(fd)
+
 def compute_file_hash(file_path, algorithm='sha256'):
     """计算文件的哈希值
     
     Args:
         file_path: 文件路径
-        algorithm: 哈希算法，默认为SHA-256
+        algorithm: 哈希算法名称（hashlib支持的任意算法），默认为SHA-256
         
     Returns:
         str: 文件的哈希值
     """
     if not os.path.isfile(file_path):
-        logger.error(f"文件不存在: {file_path}")
+        logger.error("文件不存在: %s", file_path)
         return None
     
     try:
-        hash_obj = None
-        if algorithm.lower() == 'md5':
-            hash_obj = hashlib.md5()
-        elif algorithm.lower() == 'sha1':
-            hash_obj = hashlib.sha1()
-        elif algorithm.lower() == 'sha256':
-            hash_obj = hashlib.sha256()
-        else:
-            hash_obj = hashlib.sha256()
+        # 支持OpenSSL提供的任意定长摘要算法，未知算法回退为SHA-256；
+        # shake系列是变长摘要，hexdigest()需要指定长度，同样回退
+        algorithm = algorithm.lower()
+        if (algorithm not in hashlib.algorithms_available
+                or algorithm.startswith('shake_')):
+            algorithm = 'sha256'
+        
+        # 大文件在支持pread的平台上多线程预读
+        if hasattr(os, 'pread'):
+            size = os.path.getsize(file_path)
+            if size > _PARALLEL_HASH_THRESHOLD:
+                hash_obj = hashlib.new(algorithm)
+                _hash_file_parallel(file_path, hash_obj, size)
+                return hash_obj.hexdigest()
         
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                hash_obj.update(chunk)
+            if hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: 由hashlib在C层读取文件，避免Python层分块循环
+                return hashlib.file_digest(f, algorithm).hexdigest()
+            
+            hash_obj = hashlib.new(algorithm)
+            if os.fstat(f.fileno()).st_size > 0:
+                # 内存映射整个文件，一次性交给OpenSSL处理
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hash_obj.update(mm)
         
         return hash_obj.hexdigest()
     except Exception as e:
-        logger.error(f"计算文件 {file_path} 的哈希值失败: {str(e)}")
+        logger.error("计算文件 %s 的哈希值失败: %s", file_path, e)
         return None
 
 def create_unique_id():
@@ -94,10 +172,12 @@ def ensure_dir(directory):
         bool: 是否成功创建或已存在
     """
     try:
-        os.makedirs(directory, exist_ok=True)
+        # 目录已存在时只需一次stat，makedirs则要逐级检查并尝试mkdir
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
         return True
     except Exception as e:
-        logger.error(f"创建目录 {directory} 失败: {str(e)}")
+        logger.error("创建目录 %s 失败: %s", directory, e)
         return False
 
 def sanitize_filename(filename):
@@ -109,20 +189,43 @@ def sanitize_filename(filename):
     Returns:
         str: 安全的文件名
     """
-    # 替换不安全的字符
-    unsafe_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-    for char in unsafe_chars:
-        filename = filename.replace(char, '_')
+    # 一次替换所有不安全的字符，并确保文件名不为空
+    return filename.translate(_FILENAME_TRANS) or "unnamed"
+
+def _zip_member_target(extract_root, name):
+    """计算ZIP成员的解压路径
     
-    # 确保文件名不为空
-    if not filename:
-        return "unnamed"
+    Args:
+        extract_root: 解压目标目录（已规范化的绝对路径）
+        name: ZIP成员名称
+        
+    Returns:
+        str: 成员的解压路径
+        
+    Raises:
+        ValueError: 成员路径位于解压目录之外
+    """
+    target = os.path.realpath(os.path.join(extract_root, name))
+    if os.path.commonpath((extract_root, target)) != extract_root:
+        raise ValueError(f"ZIP成员路径越界: {name}")
+    return target
+
+def _extract_member(zip_ref, info, target):
+    """将单个ZIP成员解压到目标文件
     
-    return filename
+    Args:
+        zip_ref: 已打开的ZipFile对象
+        info: 成员的ZipInfo
+        target: 目标文件路径
+    """
+    with zip_ref.open(info) as src, open(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst, _EXTRACT_BUFFER_SIZE)
 
 def extract_zip(zip_path, extract_to):
     """解压ZIP文件
     
+    目录先统一创建，文件成员再由多个线程并行解压（解压缩时会释放GIL）
+    
     Args:
         zip_path: ZIP文件路径
         extract_to: 解压目标目录
@@ -132,36 +235,69 @@ def extract_zip(zip_path, extract_to):
     """
     try:
         ensure_dir(extract_to)
+        extract_root = os.path.realpath(extract_to)
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+            dirs = set()
+            files = []
+            for info in zip_ref.infolist():
+                target = _zip_member_target(extract_root, info.filename)
+                if info.is_dir():
+                    dirs.add(target)
+                else:
+                    dirs.add(os.path.dirname(target))
+                    files.append((info, target))
+            
+            # 上级目录会随子目录一并创建，只需创建最深一层的目录
+            parents = set()
+            for directory in dirs:
+                parent = os.path.dirname(directory)
+                while parent != extract_root and parent not in parents:
+                    parents.add(parent)
+                    parent = os.path.dirname(parent)
+            for directory in dirs - parents:
+                os.makedirs(directory, exist_ok=True)
+            
+            if len(files) > 1:
+                with ThreadPoolExecutor(max_workers=min(4, len(files))) as executor:
+                    list(executor.map(lambda item: _extract_member(zip_ref, *item), files))
+            else:
+                for info, target in files:
+                    _extract_member(zip_ref, info, target)
         return True
     except Exception as e:
-        logger.error(f"解压文件 {zip_path} 到 {extract_to} 失败: {str(e)}")
+        logger.error("解压文件 %s 到 %s 失败: %s", zip_path, extract_to, e)
         return False
 
-def create_zip(source_path, zip_path):
+def create_zip(source_path, zip_path, compresslevel=1):
     """创建ZIP文件
     
     Args:
         source_path: 源文件或目录路径
         zip_path: 目标ZIP文件路径
+        compresslevel: DEFLATE压缩级别（0-9），默认使用最快的1级
         
     Returns:
         bool: 是否成功创建
     """
+    # 先写入同目录下的临时文件，完成后原子替换，避免留下不完整的ZIP
+    temp_file = f"{zip_path}.tmp"
     try:
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        with zipfile.ZipFile(temp_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zipf:
             if os.path.isfile(source_path):
                 zipf.write(source_path, os.path.basename(source_path))
             else:
+                base_dir = os.path.dirname(source_path)
                 for root, _, files in os.walk(source_path):
                     for file in files:
                         file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, os.path.dirname(source_path))
-                        zipf.write(file_path, arcname)
+                        zipf.write(file_path, os.path.relpath(file_path, base_dir))
+        
+        os.replace(temp_file, zip_path)
         return True
     except Exception as e:
-        logger.error(f"创建ZIP文件 {zip_path} 失败: {str(e)}")
+        logger.error("创建ZIP文件 %s 失败: %s", zip_path, e)
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
         return False
 
 def download_file(url, local_path, progress_callback=None):
@@ -177,36 +313,47 @@ def download_file(url, local_path, progress_callback=None):
     """
     try:
         # 创建目标目录
-        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        ensure_dir(os.path.dirname(local_path))
         
         # 下载到临时文件
         temp_file = local_path + '.download'
         
-        # 开始下载
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        # 获取文件大小
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded_size = 0
+        # requests及其依赖导入较慢，只在实际下载时导入
+        import requests
         
-        # 写入文件
-        with open(temp_file, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded_size += len(chunk)
-                    if progress_callback:
-                        progress_callback(downloaded_size, total_size)
+        # 开始下载，直接从底层连接按大块读取，减少Python层循环次数
+        with requests.get(url, stream=True, timeout=(5, 30)) as response:
+            response.raise_for_status()
+            raw = response.raw
+            raw.decode_content = True
+            
+            # 写入文件
+            with open(temp_file, 'wb', buffering=_DOWNLOAD_CHUNK_SIZE) as f:
+                if progress_callback is None:
+                    shutil.copyfileobj(raw, f, _DOWNLOAD_CHUNK_SIZE)
+                else:
+                    # 获取文件大小
+                    total_size = int(response.headers.get('content-length', 0))
+                    downloaded_size = 0
+                    last_emit_time = time.monotonic()
+                    for chunk in iter(lambda: raw.read(_DOWNLOAD_CHUNK_SIZE), b''):
+                        f.write(chunk)
+                        downloaded_size += len(chunk)
+                        # 限制回调频率，避免高速下载时频繁触发界面更新
+                        now = time.monotonic()
+                        if now - last_emit_time >= _PROGRESS_INTERVAL:
+                            last_emit_time = now
+                            progress_callback(downloaded_size, total_size)
+                    
+                    # 完成时总是报告最终进度
+                    progress_callback(downloaded_size, total_size)
         
-        # 下载完成后重命名
-        if os.path.exists(local_path):
-            os.remove(local_path)
-        shutil.move(temp_file, local_path)
+        # 下载完成后原子替换目标文件（临时文件位于同一目录，不会跨文件系统）
+        os.replace(temp_file, local_path)
         
         return True
     except Exception as e:
-        logger.error(f"下载文件 {url} 到 {local_path} 失败: {str(e)}")
+        logger.error("下载文件 %s 到 %s 失败: %s", url, local_path, e)
         if os.path.exists(temp_file):
             os.remove(temp_file)
         return False
@@ -220,10 +367,25 @@ def is_valid_json(json_str):
     Returns:
         bool: 是否为有效的JSON
     """
+    # 首字符不可能构成JSON时无需解析
+    if isinstance(json_str, str):
+        stripped = json_str.lstrip(_JSON_WHITESPACE)
+        if not stripped or stripped[0] not in _JSON_START_CHARS:
+            return False
+    
+    try:
+        _json_loads(json_str)
+        return True
+    except (ValueError, TypeError):
+        if _json_loads is json.loads:
+            return False
+    
+    # orjson拒绝标准库接受的输入（NaN/Infinity、超过64位的整数等），
+    # 仅在失败时用标准库复核，保证与json.loads的判定一致
     try:
         json.loads(json_str)
         return True
-    except:
+    except (ValueError, TypeError):
         return False
 
 def timeit(func):
@@ -237,30 +399,61 @@ def timeit(func):
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        # 未开启DEBUG时不计时，也不格式化日志
+        if not logger.isEnabledFor(logging.DEBUG):
+            return func(*args, **kwargs)
+        start_time = time.perf_counter()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        logger.debug(f"函数 {func.__name__} 执行时间: {end_time - start_time:.4f} 秒")
+        logger.debug("函数 %s 执行时间: %.4f 秒", func.__name__, time.perf_counter() - start_time)
         return result
     return wrapper
 
-class WorkerThread(QThread):
-    """工作线程基类"""
+class WorkerSignals(QObject):
+    """WorkerRunnable的信号"""
+    
+    started = pyqtSignal()
+    finished = pyqtSignal(object)  # 传递结果
+    progress = pyqtSignal(int)     # 进度百分比
+    error = pyqtSignal(str)        # 错误信息
+
+class WorkerRunnable(QRunnable):
+    """可取消的后台任务基类
     
-    # 信号定义
-    started_signal = pyqtSignal()
-    finished_signal = pyqtSignal(object)  # 传递结果
-    progress_signal = pyqtSignal(int)     # 进度百分比
-    error_signal = pyqtSignal(str)        # 错误信息
+    在线程池中执行，不单独创建线程。可直接交给QThreadPool，
+    也可通过 ThreadManager.run_task(worker.run) 提交
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+    
+    @property
+    def cancelled(self):
+        """是否已请求取消"""
+        return self._cancelled.is_set()
     
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.cancelled = False
+    def execute(self):
+        """任务执行函数，需要在子类中重写
+        
+        执行期间应定期检查 cancelled 并在取消时尽快返回
+        
+        Returns:
+            任务结果，通过finished信号传递
+        """
+        raise NotImplementedError("在子类中实现execute方法")
     
     def run(self):
-        """线程执行函数，需要在子类中重写"""
-        raise NotImplementedError("在子类中实现run方法")
+        """执行任务并发出相应信号"""
+        self.signals.started.emit()
+        try:
+            result = self.execute()
+        except Exception as e:
+            logger.error("后台任务执行出错: %s", e, exc_info=True)
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
     
     def cancel(self):
-        """取消线程执行"""
-        self.cancelled = True 
\ No newline at end of file
+        """请求取消任务"""
+        self._cancelled.set()
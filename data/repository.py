@@ -13,7 +13,125 @@ import sqlite3
 import logging
 import threading
 import time
+import functools
 from pathlib import Path
+from contextlib import contextmanager
+
+# orjson为可选依赖，序列化和解析速度明显快于标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj):
+        """将Python对象序列化为JSON字符串"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    def _dumps_bytes(obj):
+        """将Python对象序列化为带缩进的UTF-8 JSON字节数据"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    
+    # orjson.JSONDecodeError是json.JSONDecodeError的子类，调用方的异常处理无需修改
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        """将Python对象序列化为JSON字符串"""
+        return json.dumps(obj, ensure_ascii=False)
+    
+    def _dumps_bytes(obj):
+        """将Python对象序列化为带缩进的UTF-8 JSON字节数据"""
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    
+    _loads = json.loads
+
+# plugins表的列，查询时按此顺序投影
+_PLUGIN_COLS = ('id', 'name', 'version', 'author', 'description', 'install_date', 'enabled', 'metadata')
+_PLUGIN_SELECT_SQL = f"SELECT {', '.join(_PLUGIN_COLS)} FROM plugins"
+_PLUGIN_UPSERT_SQL = (
+    f"INSERT OR REPLACE INTO plugins ({', '.join(_PLUGIN_COLS)}) "
+    f"VALUES ({', '.join('?' * len(_PLUGIN_COLS))})"
+)
+
+# 缓存表及其过期时间索引，持久缓存和内存缓存共用
+_CACHE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    expiry INTEGER
+)
+"""
+_CACHE_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_cache_expiry ON cache(expiry) WHERE expiry > 0"
+
+# 清理过期缓存时，持久缓存删除超过该行数才回收空闲页，每次最多回收的页数
+_VACUUM_ROW_THRESHOLD = 100
+_VACUUM_PAGES = 64
+
+# 存储值不是有效JSON时的解析结果标记
+_NOT_JSON = object()
+
+# 原始字符串值的存储前缀，读取时去掉前缀即可，无需尝试JSON解析。
+# 有效的JSON文本不会以控制字符开头，因此不会与JSON编码的值混淆
+_RAW_STR_TAG = '\x01'
+
+@functools.lru_cache(maxsize=1024)
+def _cached_loads(text):
+    """按内容缓存标量值的解析结果
+    
+    结果只由文本内容决定，写入时无需失效；只缓存不可变的标量，
+    避免调用方修改返回的对象影响缓存
+    """
+    try:
+        return _loads(text)
+    except json.JSONDecodeError:
+        return _NOT_JSON
+
+def _decode_value(value):
+    """将存储的字符串转换为Python对象，不是有效JSON时返回原始字符串"""
+    if value is None:
+        return None
+    
+    # 带前缀的原始字符串直接返回
+    if value[:1] == _RAW_STR_TAG:
+        return value[1:]
+    
+    # 对象和数组每次重新解析，返回独立的副本
+    if value[:1] in ('{', '['):
+        try:
+            return _loads(value)
+        except json.JSONDecodeError:
+            return value
+    
+    result = _cached_loads(value)
+    return value if result is _NOT_JSON else result
+
+def _encode_value(value):
+    """将配置值转换为存储用的字符串
+    
+    字符串加上_RAW_STR_TAG前缀原样保存，其他非None值编码为JSON
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return _RAW_STR_TAG + value
+    return _dumps(value)
+
+class _ConnectionHolder:
+    """线程本地的数据库连接持有者
+    
+    线程结束时其线程本地数据被释放，持有者随之回收，并通过release关闭该线程的连接
+    """
+    
+    __slots__ = ('connection', 'generation', 'release')
+    
+    def __init__(self, connection, generation, release=None):
+        self.connection = connection
+        self.generation = generation
+        self.release = release  # 为None时不关闭连接（如共用的内存数据库连接）
+    
+    def __del__(self):
+        if self.release is not None:
+            self.release(self.connection)
 
 class Repository:
     """数据仓库类
@@ -35,8 +153,18 @@ class Repository:
         
         self.data_dir = None
         self.db_path = None
-        self.db_connection = None
-        self.lock = threading.RLock()  # 用于线程安全
+        self._local = threading.local()  # 各线程自己的数据库连接，线程结束时自动关闭
+        self._connections = set()        # 已打开的全部连接，供close()统一关闭
+        self._generation = 0             # 每次close()后递增，使各线程缓存的连接失效
+        self.lock = threading.RLock()    # 保护连接的创建和关闭
+        
+        # 非持久缓存所在的内存数据库，由所有线程共用
+        self._cache_connection = None
+        self._cache_lock = threading.Lock()
+        
+        # 定期清理过期缓存的后台线程
+        self._cache_sweep_stop = threading.Event()
+        self._cache_sweep_thread = None
         
         # 从配置加载路径
         if self.config:
@@ -74,6 +202,9 @@ class Repository:
             # 初始化数据库
             self._init_database()
             
+            # 启动过期缓存清理线程
+            self._start_cache_sweeper()
+            
             self.logger.info(f"数据仓库初始化成功，数据目录: {self.data_dir}")
             self.logger.info(f"数据库路径: {self.db_path}")
             
@@ -123,46 +254,183 @@ class Repository:
             )
             ''')
             
-            # 创建缓存表
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cache (
-                key TEXT PRIMARY KEY,
-                value TEXT,
-                expiry INTEGER
-            )
-            ''')
+            # 创建持久缓存表
+            cursor.execute(_CACHE_TABLE_SQL)
+            
+            # 部分索引：只索引会过期的缓存和已启用的插件，
+            # 用于clear_expired_cache的范围删除和get_all_plugins(enabled_only=True)
+            cursor.execute(_CACHE_INDEX_SQL)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_plugins_enabled ON plugins(enabled) WHERE enabled = 1")
             
             conn.commit()
     
     def get_db_connection(self):
-        """获取数据库连接
+        """获取当前线程的数据库连接
         
-        返回一个SQLite连接对象，如果连接不存在则创建
+        每个线程使用独立的连接，如果连接不存在则创建，WAL模式下各线程的读操作可以并行。
+        内存数据库无法在连接之间共享，所有线程共用同一个连接
         
         Returns:
             sqlite3.Connection: 数据库连接
         """
+        local = self._local
+        holder = getattr(local, 'holder', None)
+        if holder is not None and holder.generation == self._generation:
+            return holder.connection
+        
         with self.lock:
-            if self.db_connection is None:
-                self.db_connection = sqlite3.connect(
-                    self.db_path, 
-                    detect_types=sqlite3.PARSE_DECLTYPES,
-                    check_same_thread=False  # 允许在多个线程中使用相同的连接
-                )
-                # 启用外键约束
-                self.db_connection.execute("PRAGMA foreign_keys = ON")
-                # 配置数据库返回行为字典
-                self.db_connection.row_factory = sqlite3.Row
-            
-            return self.db_connection
+            if self.db_path == ':memory:' and self._connections:
+                conn = next(iter(self._connections))
+                release = None
+            else:
+                conn = self._open_connection()
+                self._connections.add(conn)
+                release = self._release_connection
+            # 线程结束时持有者被回收，自动关闭该线程的连接
+            local.holder = _ConnectionHolder(conn, self._generation, release)
+        return conn
+    
+    def _release_connection(self, conn):
+        """关闭已结束线程的数据库连接
+        
+        Args:
+            conn: 数据库连接
+        """
+        with self.lock:
+            self._connections.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    
+    def _open_connection(self):
+        """打开一个新的数据库连接并完成配置
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        conn = sqlite3.connect(
+            self.db_path, 
+            check_same_thread=False,  # 允许close()在其他线程中关闭连接
+            cached_statements=256     # 预编译语句缓存，容纳所有参数化SQL
+        )
+        # 启用外键约束
+        conn.execute("PRAGMA foreign_keys = ON")
+        self._apply_pragmas(conn)
+        # 配置数据库返回行为字典
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _apply_pragmas(self, conn):
+        """设置连接的性能相关参数
+        
+        新建的数据库启用增量自动清理，删除数据后空闲页可由incremental_vacuum回收；
+        该设置必须在切换WAL和建表之前执行，对已有表的数据库不生效。
+        文件数据库使用WAL日志，读写互不阻塞，且每次提交无需fsync。
+        WAL文件由SQLite自动检查点回收，如需收缩可通过thread_manager
+        定期执行 PRAGMA wal_checkpoint(TRUNCATE)
+        
+        Args:
+            conn: 数据库连接
+        """
+        if self.db_path != ':memory:':
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -65536")    # 64 MiB页缓存
+        conn.execute("PRAGMA mmap_size = 268435456")  # 256 MiB内存映射
+        conn.execute("PRAGMA busy_timeout = 3000")
+    
+    @contextmanager
+    def transaction(self):
+        """在单个写事务中执行多条语句
+        
+        正常退出时提交，发生异常时回滚，所有写入只提交一次；
+        当前线程已处于事务中时改用保存点嵌套在外层事务内，异常时只回滚本层写入，
+        最终由外层提交，因此批量保存方法可以在transaction()内部调用
+        
+        Yields:
+            sqlite3.Cursor: 数据库游标
+        """
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        if conn.in_transaction:
+            cursor.execute("SAVEPOINT nested_write")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK TO nested_write")
+                cursor.execute("RELEASE nested_write")
+                raise
+            else:
+                cursor.execute("RELEASE nested_write")
+            finally:
+                cursor.close()
+            return
+        
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            cursor.close()
+    
+    @contextmanager
+    def _connection(self):
+        """获取当前线程的数据库连接，退出时提交
+        
+        与sqlite3连接的上下文管理器相同，正常退出时提交、发生异常时回滚；
+        进入时已处于transaction()中则不提交也不回滚，由外层事务负责
+        
+        Yields:
+            sqlite3.Connection: 数据库连接
+        """
+        conn = self.get_db_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        with conn:
+            yield conn
+    
+    def _start_cache_sweeper(self, interval=60.0):
+        """启动定期清理过期缓存的后台线程
+        
+        get_cache遇到过期条目时只返回默认值，删除统一由该线程批量完成，读路径不产生写事务
+        
+        Args:
+            interval: 清理间隔（秒）
+        """
+        if self._cache_sweep_thread is not None and self._cache_sweep_thread.is_alive():
+            return
+        
+        def sweep():
+            while not self._cache_sweep_stop.wait(interval):
+                self.clear_expired_cache()
+        
+        self._cache_sweep_stop.clear()
+        self._cache_sweep_thread = threading.Thread(target=sweep, daemon=True)
+        self._cache_sweep_thread.start()
     
     def close(self):
         """关闭数据库连接"""
+        self._cache_sweep_stop.set()
         with self.lock:
-            if self.db_connection:
-                self.db_connection.close()
-                self.db_connection = None
+            if self._connections:
+                for conn in self._connections:
+                    conn.close()
+                self._connections.clear()
                 self.logger.debug("数据库连接已关闭")
+            self._generation += 1
+        
+        with self._cache_lock:
+            if self._cache_connection is not None:
+                self._cache_connection.close()
+                self._cache_connection = None
     
     # 插件相关方法
     
@@ -175,31 +443,47 @@ class Repository:
         Returns:
             bool: 是否成功保存
         """
-        try:
-            if not all(k in plugin_data for k in ['id', 'name', 'version']):
-                self.logger.error("保存插件信息失败: 缺少必要字段")
-                return False
-            
-            # 将dict类型的metadata转为JSON字符串
-            if 'metadata' in plugin_data and isinstance(plugin_data['metadata'], dict):
-                plugin_data['metadata'] = json.dumps(plugin_data['metadata'], ensure_ascii=False)
+        return self.save_plugins_bulk([plugin_data])
+    
+    def save_plugins_bulk(self, plugins_data):
+        """在一个事务中批量保存插件信息
+        
+        Args:
+            plugins_data: 插件信息字典列表，每项必须包含id、name和version字段
             
-            with self.get_db_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 构建SQL语句
-                fields = list(plugin_data.keys())
-                placeholders = ['?'] * len(fields)
-                values = [plugin_data[field] for field in fields]
-                
-                # 使用INSERT OR REPLACE语法
-                sql = f"INSERT OR REPLACE INTO plugins ({', '.join(fields)}) VALUES ({', '.join(placeholders)})"
+        Returns:
+            bool: 是否全部保存成功，任一项失败时整批回滚
+        """
+        try:
+            rows = []
+            for plugin_data in plugins_data:
+                if not all(k in plugin_data for k in ['id', 'name', 'version']):
+                    self.logger.error("保存插件信息失败: 缺少必要字段")
+                    return False
                 
-                cursor.execute(sql, values)
-                conn.commit()
+                # 将dict类型的metadata转为JSON字符串
+                metadata = plugin_data.get('metadata')
+                if isinstance(metadata, dict):
+                    metadata = _dumps(metadata)
                 
-                self.logger.debug(f"插件 {plugin_data['id']} 保存成功")
-                return True
+                # 按_PLUGIN_COLS的顺序取值，缺失的列为NULL，enabled与表定义一致默认为1
+                rows.append((
+                    plugin_data['id'],
+                    plugin_data['name'],
+                    plugin_data['version'],
+                    plugin_data.get('author'),
+                    plugin_data.get('description'),
+                    plugin_data.get('install_date'),
+                    plugin_data.get('enabled', 1),
+                    metadata
+                ))
+            
+            # 语句固定，SQLite只需准备一次
+            with self.transaction() as cursor:
+                cursor.executemany(_PLUGIN_UPSERT_SQL, rows)
+            
+            self.logger.debug(f"保存 {len(rows)} 个插件信息成功")
+            return True
         except Exception as e:
             self.logger.error(f"保存插件信息失败: {str(e)}")
             return False
@@ -214,28 +498,39 @@ class Repository:
             dict: 插件信息字典，如果不存在则返回None
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM plugins WHERE id = ?", (plugin_id,))
+                cursor.row_factory = None  # 直接返回元组，按列顺序转换
+                cursor.execute(f"{_PLUGIN_SELECT_SQL} WHERE id = ?", (plugin_id,))
                 row = cursor.fetchone()
                 
                 if row:
-                    # 将行转换为字典
-                    plugin_data = dict(row)
-                    
-                    # 将JSON字符串转换回dict
-                    if 'metadata' in plugin_data and plugin_data['metadata']:
-                        try:
-                            plugin_data['metadata'] = json.loads(plugin_data['metadata'])
-                        except json.JSONDecodeError:
-                            self.logger.warning(f"插件 {plugin_id} 的metadata不是有效的JSON")
-                    
-                    return plugin_data
+                    return self._row_to_plugin(row)
                 return None
         except Exception as e:
             self.logger.error(f"获取插件 {plugin_id} 信息失败: {str(e)}")
             return None
     
+    def _row_to_plugin(self, row):
+        """将plugins表的行元组转换为插件信息字典
+        
+        Args:
+            row: 按_PLUGIN_COLS顺序排列的列值
+            
+        Returns:
+            dict: 插件信息字典
+        """
+        plugin_data = dict(zip(_PLUGIN_COLS, row))
+        
+        # 将JSON字符串转换回dict
+        if plugin_data['metadata']:
+            try:
+                plugin_data['metadata'] = _loads(plugin_data['metadata'])
+            except json.JSONDecodeError:
+                self.logger.warning(f"插件 {plugin_data['id']} 的metadata不是有效的JSON")
+        
+        return plugin_data
+    
     def get_all_plugins(self, enabled_only=False):
         """获取所有插件信息
         
@@ -246,30 +541,18 @@ class Repository:
             list: 插件信息字典列表
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None  # 直接返回元组，按列顺序转换
                 
                 if enabled_only:
-                    cursor.execute("SELECT * FROM plugins WHERE enabled = 1")
+                    cursor.execute(f"{_PLUGIN_SELECT_SQL} WHERE enabled = 1")
                 else:
-                    cursor.execute("SELECT * FROM plugins")
-                
-                rows = cursor.fetchall()
+                    cursor.execute(_PLUGIN_SELECT_SQL)
                 
-                plugins = []
-                for row in rows:
-                    plugin_data = dict(row)
-                    
-                    # 将JSON字符串转换回dict
-                    if 'metadata' in plugin_data and plugin_data['metadata']:
-                        try:
-                            plugin_data['metadata'] = json.loads(plugin_data['metadata'])
-                        except json.JSONDecodeError:
-                            self.logger.warning(f"插件 {plugin_data['id']} 的metadata不是有效的JSON")
-                    
-                    plugins.append(plugin_data)
-                
-                return plugins
+                # 直接迭代游标，不先构建完整的行列表
+                row_to_plugin = self._row_to_plugin
+                return [row_to_plugin(row) for row in cursor]
         except Exception as e:
             self.logger.error(f"获取插件列表失败: {str(e)}")
             return []
@@ -284,10 +567,9 @@ class Repository:
             bool: 是否成功删除
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM plugins WHERE id = ?", (plugin_id,))
-                conn.commit()
                 
                 rows_affected = cursor.rowcount
                 self.logger.debug(f"删除插件 {plugin_id}: 影响了 {rows_affected} 行")
@@ -307,13 +589,12 @@ class Repository:
             bool: 是否成功设置
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "UPDATE plugins SET enabled = ? WHERE id = ?",
                     (1 if enabled else 0, plugin_id)
                 )
-                conn.commit()
                 
                 rows_affected = cursor.rowcount
                 self.logger.debug(f"设置插件 {plugin_id} 启用状态为 {enabled}: 影响了 {rows_affected} 行")
@@ -335,24 +616,30 @@ class Repository:
         Returns:
             bool: 是否成功保存
         """
-        try:
-            # 将值转换为JSON字符串
-            if value is not None:
-                if not isinstance(value, str):
-                    value = json.dumps(value, ensure_ascii=False)
+        return self.save_plugin_configs_bulk(plugin_id, {key: value})
+    
+    def save_plugin_configs_bulk(self, plugin_id, configs):
+        """在一个事务中批量保存插件配置
+        
+        Args:
+            plugin_id: 插件ID
+            configs: 配置键值字典（值将自动转换为JSON字符串）
             
-            with self.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
+        Returns:
+            bool: 是否成功保存
+        """
+        try:
+            rows = [(plugin_id, key, _encode_value(value)) for key, value in configs.items()]
+            with self.transaction() as cursor:
+                cursor.executemany(
                     "INSERT OR REPLACE INTO plugin_configs (plugin_id, key, value) VALUES (?, ?, ?)",
-                    (plugin_id, key, value)
+                    rows
                 )
-                conn.commit()
-                
-                self.logger.debug(f"保存插件 {plugin_id} 配置 {key} 成功")
-                return True
+            
+            self.logger.debug(f"保存插件 {plugin_id} 的 {len(rows)} 项配置成功")
+            return True
         except Exception as e:
-            self.logger.error(f"保存插件 {plugin_id} 配置 {key} 失败: {str(e)}")
+            self.logger.error(f"保存插件 {plugin_id} 配置失败: {str(e)}")
             return False
     
     def get_plugin_config(self, plugin_id, key, default=None):
@@ -367,7 +654,7 @@ class Repository:
             任意值: 配置值，如果是JSON字符串则转换为对应的Python对象
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT value FROM plugin_configs WHERE plugin_id = ? AND key = ?",
@@ -376,13 +663,8 @@ class Repository:
                 row = cursor.fetchone()
                 
                 if row and row['value'] is not None:
-                    value = row['value']
-                    # 尝试将JSON字符串转换为Python对象
-                    try:
-                        return json.loads(value)
-                    except json.JSONDecodeError:
-                        # 如果不是有效的JSON，则返回原始字符串
-                        return value
+                    # 将JSON字符串转换为Python对象，不是有效的JSON则返回原始字符串
+                    return _decode_value(row['value'])
                 return default
         except Exception as e:
             self.logger.error(f"获取插件 {plugin_id} 配置 {key} 失败: {str(e)}")
@@ -398,31 +680,41 @@ class Repository:
             dict: 包含所有配置的字典
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None  # 直接返回(key, value)元组
                 cursor.execute(
                     "SELECT key, value FROM plugin_configs WHERE plugin_id = ?",
                     (plugin_id,)
                 )
-                rows = cursor.fetchall()
                 
-                configs = {}
-                for row in rows:
-                    key = row['key']
-                    value = row['value']
-                    
-                    # 尝试将JSON字符串转换为Python对象
-                    if value is not None:
-                        try:
-                            configs[key] = json.loads(value)
-                        except json.JSONDecodeError:
-                            configs[key] = value
-                    else:
-                        configs[key] = None
+                # 尝试将JSON字符串转换为Python对象
+                return {key: _decode_value(value) for key, value in cursor}
+        except Exception as e:
+            self.logger.error(f"获取插件 {plugin_id} 的所有配置失败: {str(e)}")
+            return {}
+    
+    def get_all_plugin_configs_bulk(self):
+        """一次查询获取所有插件的配置
+        
+        Returns:
+            dict: 插件ID -> 配置字典
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None  # 直接返回(plugin_id, key, value)元组
+                cursor.execute("SELECT plugin_id, key, value FROM plugin_configs")
                 
+                configs = {}
+                for plugin_id, key, value in cursor:
+                    settings = configs.get(plugin_id)
+                    if settings is None:
+                        settings = configs[plugin_id] = {}
+                    settings[key] = _decode_value(value)
                 return configs
         except Exception as e:
-            self.logger.error(f"获取插件 {plugin_id} 的所有配置失败: {str(e)}")
+            self.logger.error(f"获取所有插件配置失败: {str(e)}")
             return {}
     
     def delete_plugin_config(self, plugin_id, key):
@@ -436,13 +728,12 @@ class Repository:
             bool: 是否成功删除
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "DELETE FROM plugin_configs WHERE plugin_id = ? AND key = ?",
                     (plugin_id, key)
                 )
-                conn.commit()
                 
                 rows_affected = cursor.rowcount
                 self.logger.debug(f"删除插件 {plugin_id} 配置 {key}: 影响了 {rows_affected} 行")
@@ -463,24 +754,29 @@ class Repository:
         Returns:
             bool: 是否成功保存
         """
-        try:
-            # 将值转换为JSON字符串
-            if value is not None:
-                if not isinstance(value, str):
-                    value = json.dumps(value, ensure_ascii=False)
+        return self.save_preferences_bulk({key: value})
+    
+    def save_preferences_bulk(self, preferences):
+        """在一个事务中批量保存用户偏好设置
+        
+        Args:
+            preferences: 偏好键值字典（值将自动转换为JSON字符串）
             
-            with self.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
+        Returns:
+            bool: 是否成功保存
+        """
+        try:
+            rows = [(key, _encode_value(value)) for key, value in preferences.items()]
+            with self.transaction() as cursor:
+                cursor.executemany(
                     "INSERT OR REPLACE INTO user_preferences (key, value) VALUES (?, ?)",
-                    (key, value)
+                    rows
                 )
-                conn.commit()
-                
-                self.logger.debug(f"保存用户偏好 {key} 成功")
-                return True
+            
+            self.logger.debug(f"保存 {len(rows)} 项用户偏好成功")
+            return True
         except Exception as e:
-            self.logger.error(f"保存用户偏好 {key} 失败: {str(e)}")
+            self.logger.error(f"保存用户偏好失败: {str(e)}")
             return False
     
     def get_preference(self, key, default=None):
@@ -494,19 +790,14 @@ class Repository:
             任意值: 偏好值，如果是JSON字符串则转换为对应的Python对象
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT value FROM user_preferences WHERE key = ?", (key,))
                 row = cursor.fetchone()
                 
                 if row and row['value'] is not None:
-                    value = row['value']
-                    # 尝试将JSON字符串转换为Python对象
-                    try:
-                        return json.loads(value)
-                    except json.JSONDecodeError:
-                        # 如果不是有效的JSON，则返回原始字符串
-                        return value
+                    # 将JSON字符串转换为Python对象，不是有效的JSON则返回原始字符串
+                    return _decode_value(row['value'])
                 return default
         except Exception as e:
             self.logger.error(f"获取用户偏好 {key} 失败: {str(e)}")
@@ -519,26 +810,13 @@ class Repository:
             dict: 包含所有偏好的字典
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None  # 直接返回(key, value)元组
                 cursor.execute("SELECT key, value FROM user_preferences")
-                rows = cursor.fetchall()
-                
-                preferences = {}
-                for row in rows:
-                    key = row['key']
-                    value = row['value']
-                    
-                    # 尝试将JSON字符串转换为Python对象
-                    if value is not None:
-                        try:
-                            preferences[key] = json.loads(value)
-                        except json.JSONDecodeError:
-                            preferences[key] = value
-                    else:
-                        preferences[key] = None
                 
-                return preferences
+                # 尝试将JSON字符串转换为Python对象
+                return {key: _decode_value(value) for key, value in cursor}
         except Exception as e:
             self.logger.error(f"获取所有用户偏好失败: {str(e)}")
             return {}
@@ -553,10 +831,9 @@ class Repository:
             bool: 是否成功删除
         """
         try:
-            with self.get_db_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM user_preferences WHERE key = ?", (key,))
-                conn.commit()
                 
                 rows_affected = cursor.rowcount
                 self.logger.debug(f"删除用户偏好 {key}: 影响了 {rows_affected} 行")
@@ -567,125 +844,171 @@ class Repository:
     
     # 缓存相关方法
     
-    def save_cache(self, key, value, ttl=3600):
+    def _open_cache_connection(self):
+        """打开存放非持久缓存的内存数据库
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        conn.execute(_CACHE_TABLE_SQL)
+        conn.execute(_CACHE_INDEX_SQL)
+        return conn
+    
+    @contextmanager
+    def _cache_cursor(self, persistent=False):
+        """获取缓存表所在数据库的游标，退出时提交
+        
+        非持久缓存位于所有线程共用的内存数据库中，读写不产生磁盘I/O，重启后丢失；
+        持久缓存位于主数据库文件中
+        
+        Args:
+            persistent: 是否使用持久缓存
+            
+        Yields:
+            sqlite3.Cursor: 数据库游标，返回行为元组
+        """
+        if persistent:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                yield cursor
+            return
+        
+        with self._cache_lock:
+            if self._cache_connection is None:
+                self._cache_connection = self._open_cache_connection()
+            with self._cache_connection as conn:
+                yield conn.cursor()
+    
+    def save_cache(self, key, value, ttl=3600, persistent=False):
         """保存缓存数据
         
         Args:
             key: 缓存键
             value: 缓存值（将自动转换为JSON字符串）
             ttl: 生存时间（秒），默认1小时
+            persistent: 是否写入数据库文件，默认只保存在内存中
             
         Returns:
             bool: 是否成功保存
         """
-        try:
-            # 将值转换为JSON字符串
-            if value is not None:
-                if not isinstance(value, str):
-                    value = json.dumps(value, ensure_ascii=False)
+        return self.save_cache_bulk([(key, value, ttl)], persistent)
+    
+    def save_cache_bulk(self, entries, persistent=False):
+        """在一个事务中批量保存缓存数据
+        
+        Args:
+            entries: (缓存键, 缓存值, 生存时间秒数) 元组的列表，生存时间不大于0表示永不过期
+            persistent: 是否写入数据库文件，默认只保存在内存中
             
+        Returns:
+            bool: 是否成功保存
+        """
+        try:
+            now = int(time.time())
             # 计算过期时间戳
-            expiry = int(time.time()) + ttl if ttl > 0 else 0
-            
-            with self.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
+            rows = [
+                (key, _encode_value(value), now + ttl if ttl > 0 else 0)
+                for key, value, ttl in entries
+            ]
+            with self._cache_cursor(persistent) as cursor:
+                cursor.executemany(
                     "INSERT OR REPLACE INTO cache (key, value, expiry) VALUES (?, ?, ?)",
-                    (key, value, expiry)
+                    rows
                 )
-                conn.commit()
-                
-                self.logger.debug(f"保存缓存 {key} 成功，TTL: {ttl} 秒")
-                return True
+            
+            self.logger.debug(f"保存 {len(rows)} 项缓存成功")
+            return True
         except Exception as e:
-            self.logger.error(f"保存缓存 {key} 失败: {str(e)}")
+            self.logger.error(f"保存缓存失败: {str(e)}")
             return False
     
-    def get_cache(self, key, default=None):
+    def get_cache(self, key, default=None, persistent=False):
         """获取缓存数据
         
         Args:
             key: 缓存键
             default: 默认值，如果缓存不存在或已过期则返回此值
+            persistent: 是否读取数据库文件中的持久缓存
             
         Returns:
             任意值: 缓存值，如果是JSON字符串则转换为对应的Python对象
         """
         try:
-            with self.get_db_connection() as conn:
-                cursor = conn.cursor()
+            with self._cache_cursor(persistent) as cursor:
                 cursor.execute(
                     "SELECT value, expiry FROM cache WHERE key = ?",
                     (key,)
                 )
                 row = cursor.fetchone()
+            
+            if row:
+                value, expiry = row
                 
-                if row:
-                    value, expiry = row['value'], row['expiry']
-                    
-                    # 检查是否过期
-                    if expiry > 0 and int(time.time()) > expiry:
-                        # 已过期，删除缓存并返回默认值
-                        cursor.execute("DELETE FROM cache WHERE key = ?", (key,))
-                        conn.commit()
-                        self.logger.debug(f"缓存 {key} 已过期，已删除")
-                        return default
-                    
-                    # 缓存有效，尝试将JSON字符串转换为Python对象
-                    if value is not None:
-                        try:
-                            return json.loads(value)
-                        except json.JSONDecodeError:
-                            return value
+                # 检查是否过期，过期条目由后台线程定期清理
+                if expiry > 0 and int(time.time()) > expiry:
+                    return default
                 
-                return default
+                # 缓存有效，尝试将JSON字符串转换为Python对象
+                if value is not None:
+                    return _decode_value(value)
+            
+            return default
         except Exception as e:
             self.logger.error(f"获取缓存 {key} 失败: {str(e)}")
             return default
     
-    def delete_cache(self, key):
+    def delete_cache(self, key, persistent=False):
         """删除缓存数据
         
         Args:
             key: 缓存键
+            persistent: 是否删除数据库文件中的持久缓存
             
         Returns:
             bool: 是否成功删除
         """
         try:
-            with self.get_db_connection() as conn:
-                cursor = conn.cursor()
+            with self._cache_cursor(persistent) as cursor:
                 cursor.execute("DELETE FROM cache WHERE key = ?", (key,))
-                conn.commit()
-                
                 rows_affected = cursor.rowcount
-                self.logger.debug(f"删除缓存 {key}: 影响了 {rows_affected} 行")
-                return rows_affected > 0
+            
+            self.logger.debug(f"删除缓存 {key}: 影响了 {rows_affected} 行")
+            return rows_affected > 0
         except Exception as e:
             self.logger.error(f"删除缓存 {key} 失败: {str(e)}")
             return False
     
     def clear_expired_cache(self):
-        """清理过期的缓存数据
+        """清理内存缓存和持久缓存中的过期数据
         
         Returns:
             int: 删除的缓存条目数量
         """
         try:
             current_time = int(time.time())
+            rows_affected = 0
             
-            with self.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "DELETE FROM cache WHERE expiry > 0 AND expiry < ?",
-                    (current_time,)
-                )
-                conn.commit()
-                
-                rows_affected = cursor.rowcount
-                if rows_affected > 0:
-                    self.logger.debug(f"清理过期缓存: 删除了 {rows_affected} 条记录")
-                return rows_affected
+            for persistent in (False, True):
+                with self._cache_cursor(persistent) as cursor:
+                    cursor.execute(
+                        "DELETE FROM cache WHERE expiry > 0 AND expiry < ?",
+                        (current_time,)
+                    )
+                    rows_affected += cursor.rowcount
+            
+            # 持久缓存删除较多时回收部分空闲页，限制数据库文件的增长。
+            # executescript会执行到语句完成，execute只会回收一页；
+            # 但executescript会先提交未完成的事务，在transaction()内调用时跳过，
+            # 留给下一次清理
+            conn = self.get_db_connection()
+            if cursor.rowcount > _VACUUM_ROW_THRESHOLD and not conn.in_transaction:
+                conn.executescript(f"PRAGMA incremental_vacuum({_VACUUM_PAGES})")
+            
+            if rows_affected > 0:
+                self.logger.debug(f"清理过期缓存: 删除了 {rows_affected} 条记录")
+            return rows_affected
         except Exception as e:
             self.logger.error(f"清理过期缓存失败: {str(e)}")
             return 0
@@ -705,13 +1028,20 @@ class Repository:
         try:
             file_path = os.path.join(self.data_dir, filename)
             
-            # 确保目录存在
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
             # 先写入临时文件，然后重命名，避免写入过程中的文件损坏
             temp_file = file_path + '.tmp'
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            try:
+                f = open(temp_file, 'wb')
+            except FileNotFoundError:
+                # 目录不存在时才创建，通常情况下不产生额外的系统调用
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                f = open(temp_file, 'wb')
+            
+            with f:
+                f.write(_dumps_bytes(data))
+                # 落盘后再重命名，保证替换后的文件内容完整
+                f.flush()
+                os.fsync(f.fileno())
             
             # 重命名临时文件
             os.replace(temp_file, file_path)
@@ -739,8 +1069,8 @@ class Repository:
                 self.logger.debug(f"JSON文件 {filename} 不存在，返回默认值")
                 return default
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                data = _loads(f.read())
             
             self.logger.debug(f"加载JSON文件 {filename} 成功")
             return data
@@ -771,7 +1101,9 @@ class Repository:
         """
         try:
             dir_path = os.path.join(self.data_dir, path)
-            os.makedirs(dir_path, exist_ok=True)
+            # 目录已存在时只需一次stat
+            if not os.path.isdir(dir_path):
+                os.makedirs(dir_path, exist_ok=True)
             return True
         except Exception as e:
             self.logger.error(f"创建目录 {path} 失败: {str(e)}")
@@ -17,6 +17,7 @@ import os
 import sys
 import argparse
 import logging
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 
 from core.app_core import AppCore
@@ -60,28 +61,34 @@ def main():
     
     try:
         # 处理下载和更新命令
+        # 两者都在后台执行，推迟到事件循环启动后再分发，
+        # 避免与界面初始化时的插件枚举争用，界面只按启动后的状态渲染一次
         if args.download:
             logging.info(f"将下载插件 {args.download}")
-            plugin_id = args.download
             
-            # 这里需要添加下载插件的逻辑 
-            app_core.event_system.publish('plugin.download_request', {
-                'plugin_id': plugin_id,
-                'callback': lambda r: logging.info(f"下载结果: {r}")
-            })
+            def request_download(plugin_id=args.download):
+                # 这里需要添加下载插件的逻辑
+                app_core.event_system.publish('plugin.download_request', {
+                    'plugin_id': plugin_id,
+                    'callback': lambda r: logging.info(f"下载结果: {r}")
+                })
             
+            QTimer.singleShot(0, request_download)
+        
         if args.update:
             logging.info(f"将更新插件 {args.update}")
-            plugin_id = args.update
             
             # 使用线程管理器执行更新
             def on_update_done(result):
                 logging.info(f"更新结果: {result}")
             
-            app_core.thread_manager.run_task(
-                lambda: app_core.plugin_manager.update_plugin(plugin_id),
-                on_result=on_update_done
-            )
+            def request_update(plugin_id=args.update):
+                app_core.thread_manager.run_task(
+                    lambda: app_core.plugin_manager.update_plugin(plugin_id),
+                    on_result=on_update_done
+                )
+            
+            QTimer.singleShot(0, request_update)
         
         # 启动图形界面
         ui = launch_plugin_manager_ui(app_core)
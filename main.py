@@ -11,10 +11,14 @@ import os
 import sys
 import time
 import logging
-from app import EdgePlugHubApp
+from app import EdgePlugHubApp, handle_version_only
 
 def main():
     """程序入口点"""
+    # 仅查询版本时跳过参数解析和核心初始化
+    if handle_version_only():
+        return 0
+    
     try:
         # 创建应用程序实例
         app = EdgePlugHubApp()
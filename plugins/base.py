@@ -9,8 +9,12 @@
 """
 
 import os
+import copy
+import time
+import atexit
 import logging
 import threading
+import weakref
 from typing import Dict, Any, Optional, List, Callable, Union
 
 # 导入SDK中的基类和数据类型
@@ -32,6 +36,76 @@ from ..core.exceptions import PluginError
 
 logger = logging.getLogger('plugins.base')
 
+# 所有DataType枚举值，用于过滤元数据中不支持的数据类型
+_DATATYPE_VALUES = frozenset(dt.value for dt in DataType)
+
+# set_setting写入数据库前的合并等待时间（秒）
+_SETTINGS_FLUSH_DELAY = 0.5
+
+class _SettingsFlusher:
+    """合并写入插件设置的后台线程
+    
+    所有插件共用一个常驻线程，该线程的数据库连接可以重复使用；
+    进程退出时写入所有尚未保存的设置
+    """
+    
+    def __init__(self):
+        self._pending = {}  # id(插件实例) -> (写入时间, 插件实例)
+        self._cond = threading.Condition()
+        self._thread = None
+        atexit.register(self.flush_all)
+    
+    def schedule(self, plugin):
+        """安排在合并等待时间后写入插件的设置
+        
+        Args:
+            plugin: 插件实例
+        """
+        with self._cond:
+            if id(plugin) in self._pending:
+                return
+            self._pending[id(plugin)] = (time.monotonic() + _SETTINGS_FLUSH_DELAY, plugin)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='PluginSettingsFlusher', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+    
+    def discard(self, plugin):
+        """取消插件已安排的写入"""
+        with self._cond:
+            self._pending.pop(id(plugin), None)
+    
+    def flush_all(self):
+        """立即写入所有插件尚未保存的设置"""
+        with self._cond:
+            plugins = [plugin for _, plugin in self._pending.values()]
+            self._pending.clear()
+        for plugin in plugins:
+            plugin.flush_settings()
+    
+    def _run(self):
+        """到期后写入各插件的设置"""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                
+                now = time.monotonic()
+                due = [plugin for deadline, plugin in self._pending.values() if deadline <= now]
+                if not due:
+                    self._cond.wait(min(deadline for deadline, _ in self._pending.values()) - now)
+                    continue
+                for plugin in due:
+                    del self._pending[id(plugin)]
+            
+            for plugin in due:
+                try:
+                    plugin.flush_settings()
+                except Exception as e:
+                    logger.error("保存插件 %s 设置失败: %s", plugin.plugin_id, e)
+
+_settings_flusher = _SettingsFlusher()
+
 class PluginBase(SDKPluginBase):
     """EdgePlugHub应用插件基类
     
@@ -39,6 +113,14 @@ class PluginBase(SDKPluginBase):
     所有EdgePlugHub应用插件都应该继承此类
     """
     
+    # 预取的已启用插件的信息和设置，插件ID -> 数据，由prefetch_all批量填充。
+    # 每项只在插件实例初始化时使用一次；启动时的批量加载结束（plugins.all_loaded）后
+    # 丢弃剩余的数据，插件安装、更新或卸载时丢弃对应的数据，之后加载的插件直接查询数据库
+    _metadata_cache = {}
+    _settings_cache = {}
+    _prefetched_repository = None
+    _prefetch_lock = threading.Lock()
+    
     def __init__(self, config, event_system, repository, plugin_id):
         """初始化插件基类
         
@@ -65,22 +147,97 @@ class PluginBase(SDKPluginBase):
         # 线程锁，保证线程安全
         self._lock = threading.RLock()
         
+        # 首个插件初始化时批量预取所有插件的信息和设置，
+        # 启动时加载多个插件只需两次查询
+        if PluginBase._prefetched_repository is not repository:
+            PluginBase.prefetch_all(repository)
+            if event_system is not None:
+                event_system.subscribe('plugins.all_loaded', PluginBase._on_batch_loaded)
+                for event_type in ('plugin.installed', 'plugin.updated', 'plugin.uninstalled'):
+                    event_system.subscribe(event_type, PluginBase._on_plugin_changed)
+        
         # 插件设置
         self._settings = {}
         self._load_settings()
         
+        # 尚未写入数据库的设置，由_settings_flusher合并后批量写入
+        self._pending_settings = {}
+        self._settings_lock = threading.Lock()
+        
         # 可以被其他插件调用的接口
         self.api = {}
         
+        # 插件管理器的弱引用，由管理器加载插件后设置
+        self._manager_ref = None
+        
+        # get_manifest()的结果，元数据重新加载时失效
+        self._manifest_cache = None
+        
         # 加载插件元数据
         self._load_metadata()
         
-        logger.debug(f"插件 {plugin_id} 基类初始化完成")
+        logger.debug("插件 %s 基类初始化完成", plugin_id)
+    
+    @classmethod
+    def prefetch_all(cls, repository):
+        """批量预取所有已启用插件的信息和设置
+        
+        Args:
+            repository: 数据仓库实例
+        """
+        plugins = repository.get_all_plugins(enabled_only=True)
+        settings = repository.get_all_plugin_configs_bulk()
+        with cls._prefetch_lock:
+            PluginBase._metadata_cache = {plugin['id']: plugin for plugin in plugins}
+            # 没有设置的插件也记录空字典，初始化时无需再查询
+            PluginBase._settings_cache = {
+                plugin['id']: settings.get(plugin['id'], {}) for plugin in plugins
+            }
+            PluginBase._prefetched_repository = repository
+    
+    @classmethod
+    def invalidate_cache(cls, plugin_id=None):
+        """丢弃预取的插件数据
+        
+        Args:
+            plugin_id: 插件ID，默认丢弃全部
+        """
+        with cls._prefetch_lock:
+            if plugin_id is None:
+                PluginBase._metadata_cache = {}
+                PluginBase._settings_cache = {}
+            else:
+                PluginBase._metadata_cache.pop(plugin_id, None)
+                PluginBase._settings_cache.pop(plugin_id, None)
+    
+    @staticmethod
+    def _on_batch_loaded(_):
+        """启动时的批量加载结束，丢弃未被使用的预取数据"""
+        PluginBase.invalidate_cache()
+    
+    @staticmethod
+    def _on_plugin_changed(data):
+        """插件安装、更新或卸载后丢弃其预取数据"""
+        if isinstance(data, dict) and data.get('plugin_id'):
+            PluginBase.invalidate_cache(data['plugin_id'])
+    
+    @staticmethod
+    def _take_prefetched(cache, plugin_id):
+        """取出并移除预取的数据
+        
+        Returns:
+            预取的数据，没有时返回None
+        """
+        with PluginBase._prefetch_lock:
+            return cache.pop(plugin_id, None)
     
     def _load_metadata(self):
         """从数据库加载插件元数据"""
+        self._manifest_cache = None
         try:
-            plugin_data = self.repository.get_plugin(self.plugin_id)
+            plugin_data = self._take_prefetched(PluginBase._metadata_cache, self.plugin_id)
+            if plugin_data is None:
+                plugin_data = self.repository.get_plugin(self.plugin_id)
             if plugin_data and 'metadata' in plugin_data:
                 metadata = plugin_data['metadata']
                 # 使用元数据更新插件属性
@@ -96,35 +253,51 @@ class PluginBase(SDKPluginBase):
                 output_types = metadata.get('supported_output_types', [])
                 
                 # 转换为DataType枚举
-                self.supported_input_types = [DataType(t) for t in input_types if t in [dt.value for dt in DataType]]
-                self.supported_output_types = [DataType(t) for t in output_types if t in [dt.value for dt in DataType]]
+                self.supported_input_types = [DataType(t) for t in input_types if t in _DATATYPE_VALUES]
+                self.supported_output_types = [DataType(t) for t in output_types if t in _DATATYPE_VALUES]
                 
-                logger.debug(f"已加载插件 {self.plugin_id} 的元数据")
+                logger.debug("已加载插件 %s 的元数据", self.plugin_id)
             else:
-                logger.warning(f"插件 {self.plugin_id} 没有元数据")
+                logger.warning("插件 %s 没有元数据", self.plugin_id)
         except Exception as e:
-            logger.error(f"加载插件 {self.plugin_id} 元数据失败: {str(e)}")
+            logger.error("加载插件 %s 元数据失败: %s", self.plugin_id, e)
     
     def _load_settings(self):
         """从仓库加载插件设置"""
         try:
-            settings = self.repository.get_all_plugin_configs(self.plugin_id)
+            settings = self._take_prefetched(PluginBase._settings_cache, self.plugin_id)
+            if settings is None:
+                settings = self.repository.get_all_plugin_configs(self.plugin_id)
             if settings:
                 self._settings = settings
-                logger.debug(f"已加载插件 {self.plugin_id} 的设置")
+                logger.debug("已加载插件 %s 的设置", self.plugin_id)
             else:
-                logger.debug(f"插件 {self.plugin_id} 没有保存的设置")
+                logger.debug("插件 %s 没有保存的设置", self.plugin_id)
         except Exception as e:
-            logger.error(f"加载插件 {self.plugin_id} 设置失败: {str(e)}")
+            logger.error("加载插件 %s 设置失败: %s", self.plugin_id, e)
     
     def _save_settings(self):
         """保存插件设置到仓库"""
         try:
-            for key, value in self._settings.items():
-                self.repository.save_plugin_config(self.plugin_id, key, value)
-            logger.debug(f"已保存插件 {self.plugin_id} 的设置")
+            # 所有设置在一个事务中批量写入
+            if self.repository.save_plugin_configs_bulk(self.plugin_id, self._settings):
+                logger.debug("已保存插件 %s 的设置", self.plugin_id)
         except Exception as e:
-            logger.error(f"保存插件 {self.plugin_id} 设置失败: {str(e)}")
+            logger.error("保存插件 %s 设置失败: %s", self.plugin_id, e)
+    
+    def flush_settings(self):
+        """立即写入尚未保存的设置
+        
+        Returns:
+            bool: 是否保存成功
+        """
+        _settings_flusher.discard(self)
+        with self._settings_lock:
+            pending, self._pending_settings = self._pending_settings, {}
+        
+        if not pending:
+            return True
+        return self.repository.save_plugin_configs_bulk(self.plugin_id, pending)
     
     def get_setting(self, key, default=None):
         """获取插件设置
@@ -145,15 +318,20 @@ class PluginBase(SDKPluginBase):
             key: 设置键名
             value: 设置值
             
+        连续的修改（如拖动滑块）在短时间内合并，由共用的后台线程批量写入数据库；
+        停止或清理插件以及进程退出时会写入所有未保存的设置
+        
         Returns:
             bool: 是否设置成功
         """
         try:
             self._settings[key] = value
-            self.repository.save_plugin_config(self.plugin_id, key, value)
+            with self._settings_lock:
+                self._pending_settings[key] = value
+            _settings_flusher.schedule(self)
             return True
         except Exception as e:
-            logger.error(f"保存插件 {self.plugin_id} 设置 {key} 失败: {str(e)}")
+            logger.error("保存插件 %s 设置 %s 失败: %s", self.plugin_id, key, e)
             return False
     
     # SDK方法的实现
@@ -192,7 +370,7 @@ class PluginBase(SDKPluginBase):
         """
         with self._lock:
             self._status = "running"
-            logger.info(f"插件 {self.plugin_id} 已启动")
+            logger.info("插件 %s 已启动", self.plugin_id)
             return True
     
     def stop(self):
@@ -204,9 +382,10 @@ class PluginBase(SDKPluginBase):
         Returns:
             bool: 是否停止成功
         """
+        self.flush_settings()
         with self._lock:
             self._status = "stopped"
-            logger.info(f"插件 {self.plugin_id} 已停止")
+            logger.info("插件 %s 已停止", self.plugin_id)
             return True
     
     def cleanup(self):
@@ -218,8 +397,9 @@ class PluginBase(SDKPluginBase):
         Returns:
             bool: 是否清理成功
         """
+        self.flush_settings()
         with self._lock:
-            logger.info(f"插件 {self.plugin_id} 资源已清理")
+            logger.info("插件 %s 资源已清理", self.plugin_id)
             return True
     
     def pause(self):
@@ -234,7 +414,7 @@ class PluginBase(SDKPluginBase):
         with self._lock:
             if self._status == "running":
                 self._status = "paused"
-                logger.info(f"插件 {self.plugin_id} 已暂停")
+                logger.info("插件 %s 已暂停", self.plugin_id)
                 return True
             return False
     
@@ -250,7 +430,7 @@ class PluginBase(SDKPluginBase):
         with self._lock:
             if self._status == "paused":
                 self._status = "running"
-                logger.info(f"插件 {self.plugin_id} 已恢复")
+                logger.info("插件 %s 已恢复", self.plugin_id)
                 return True
             return False
     
@@ -260,8 +440,8 @@ class PluginBase(SDKPluginBase):
         Returns:
             str: 插件状态
         """
-        with self._lock:
-            return self._status
+        # 属性读取在GIL下是原子的，只有状态转换需要加锁
+        return self._status
     
     def set_status(self, status, error=None):
         """设置插件状态
@@ -285,24 +465,27 @@ class PluginBase(SDKPluginBase):
         Returns:
             str: 错误信息
         """
-        with self._lock:
-            return self._error
+        return self._error
     
     def get_info(self):
         """获取插件信息
         
-        返回插件的运行时信息，如版本、状态等
+        返回插件的运行时信息，如版本、状态等。
+        清单部分在元数据加载后不变，只构建一次；依赖列表等嵌套值是可变对象，
+        每次调用返回深拷贝，调用方修改返回值不会影响缓存的清单
         
         Returns:
             dict: 插件信息
         """
-        with self._lock:
-            info = self.get_manifest()
-            info.update({
-                "status": self._status,
-                "error": self._error
-            })
-            return info
+        # 先取出状态和错误信息，再读取清单，读取过程不加锁
+        status, error = self._status, self._error
+        manifest = self._manifest_cache
+        if manifest is None:
+            manifest = self._manifest_cache = self.get_manifest()
+        info = copy.deepcopy(manifest)
+        info["status"] = status
+        info["error"] = error
+        return info
     
     def register_event_handlers(self):
         """注册事件处理器
@@ -332,10 +515,10 @@ class PluginBase(SDKPluginBase):
         """
         try:
             self.api[api_name] = func
-            logger.debug(f"插件 {self.plugin_id} 注册API: {api_name}")
+            logger.debug("插件 %s 注册API: %s", self.plugin_id, api_name)
             return True
         except Exception as e:
-            logger.error(f"注册API {api_name} 失败: {str(e)}")
+            logger.error("注册API %s 失败: %s", api_name, e)
             return False
     
     def unregister_api(self, api_name):
@@ -347,15 +530,21 @@ class PluginBase(SDKPluginBase):
         Returns:
             bool: 是否注销成功
         """
-        try:
-            if api_name in self.api:
-                del self.api[api_name]
-                logger.debug(f"插件 {self.plugin_id} 注销API: {api_name}")
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"注销API {api_name} 失败: {str(e)}")
+        if self.api.pop(api_name, None) is None:
             return False
+        
+        logger.debug("插件 %s 注销API: %s", self.plugin_id, api_name)
+        return True
+    
+    def set_manager(self, manager):
+        """设置加载本插件的插件管理器
+        
+        设置后call_api直接从管理器获取目标插件实例，无需经过数据库和事件系统
+        
+        Args:
+            manager: 插件管理器实例
+        """
+        self._manager_ref = weakref.ref(manager)
     
     def has_api(self, api_name):
         """检查API是否存在
@@ -381,32 +570,32 @@ class PluginBase(SDKPluginBase):
             API调用结果
         """
         try:
-            # 通过插件管理器获取目标插件
-            target_plugin = None
-            for plugin in self.repository.get_all_plugins():
-                if plugin['id'] == plugin_id:
-                    target_plugin = plugin
-                    break
-                    
+            # 通过插件管理器直接获取已加载的插件实例
+            manager = self._manager_ref() if self._manager_ref is not None else None
+            if manager is not None:
+                target = manager.get_plugin_instance(plugin_id)
+                if target is None:
+                    raise PluginError(f"插件 {plugin_id} 未加载")
+                
+                func = getattr(target, 'api', {}).get(api_name)
+                if func is None:
+                    raise PluginError(f"插件 {plugin_id} 没有API {api_name}")
+                return func(*args, **kwargs)
+            
+            # 没有插件管理器的引用时（如插件运行在其他进程中），
+            # 按主键查询目标插件后通过事件系统请求，处理方将结果字典传给callback
+            target_plugin = self.repository.get_plugin(plugin_id)
             if not target_plugin:
                 raise PluginError(f"插件 {plugin_id} 不存在")
             
-            # 获取插件实例
-            # 这里需要通过插件管理器获取已加载的插件实例
-            # 由于我们没有直接访问插件管理器的引用，可以通过事件系统请求
             response = {}
-            
-            def callback(result):
-                nonlocal response
-                response = result
-            
             self.event_system.publish('plugin.call_api', {
                 'caller_id': self.plugin_id,
                 'target_id': plugin_id,
                 'api_name': api_name,
                 'args': args,
                 'kwargs': kwargs,
-                'callback': callback
+                'callback': response.update
             })
             
             if not response:
@@ -415,7 +604,7 @@ class PluginBase(SDKPluginBase):
             return response.get('result')
             
         except Exception as e:
-            logger.error(f"调用插件 {plugin_id} 的API {api_name} 失败: {str(e)}")
+            logger.error("调用插件 %s 的API %s 失败: %s", plugin_id, api_name, e)
             raise
     
     def __str__(self):
@@ -9,9 +9,12 @@
 
 import os
 import json
+import time
+import shutil
 import logging
-import requests
-import tempfile
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 from typing import Dict, List, Any, Optional, Union
 
@@ -21,12 +24,93 @@ from core.exceptions import PluginError, PluginInstallError
 # 设置日志
 logger = logging.getLogger('plugins.downloader')
 
+# requests及其依赖（urllib3等）导入较慢，创建下载器时才由_import_requests导入
+requests = None
+
+def _import_requests():
+    """导入requests模块，只在首次调用时实际导入"""
+    global requests
+    if requests is None:
+        import requests as requests_module
+        requests = requests_module
+    return requests
+
+# 下载插件时每次读取的字节数
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# 服务器接口响应的缓存时间（秒），类别列表变化较少，缓存更久
+_CATALOG_TTL = 60
+_CATEGORIES_TTL = 600
+_PLUGIN_INFO_TTL = 60
+
+# 响应缓存的最大条目数
+_MAX_CACHE_ENTRIES = 128
+
+# 持久缓存中保存插件下载校验信息（ETag/Last-Modified）的键前缀
+_DOWNLOAD_VALIDATOR_KEY = 'plugin_download_validator:'
+
+# 连接池大小，以及并发获取多个插件信息时的最大线程数
+_POOL_CONNECTIONS = 16
+_POOL_MAXSIZE = 32
+_MAX_FETCH_WORKERS = 8
+
+def _parse_json(body):
+    """解析响应体中的JSON数据
+    
+    与response.json()一致，解析失败时抛出requests.JSONDecodeError，
+    调用方捕获requests.RequestException即可
+    
+    Args:
+        body: 响应体字节串
+        
+    Returns:
+        解析后的JSON数据
+        
+    Raises:
+        requests.JSONDecodeError: 响应体不是有效的JSON
+    """
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        if isinstance(e, json.JSONDecodeError):
+            raise requests.JSONDecodeError(e.msg, e.doc, e.pos) from e
+        # 编码错误等没有位置信息
+        raise requests.JSONDecodeError(str(e), '', 0) from e
+
+@functools.lru_cache(maxsize=None)
+def _default_download_dir():
+    """默认的插件下载目录"""
+    return os.path.join(os.path.expanduser("~"), ".edgeplughub", "downloads")
+
 class PluginDownloader:
     """插件下载器
     
     负责从远程服务器获取插件列表和下载插件
     """
     
+    # 从配置解析出的设置，同一配置管理器只解析一次，由各实例共用
+    _config_source = None
+    _server_url = None
+    _timeout = None
+    _download_dir = None
+    _user_agent = None
+    
+    @classmethod
+    def _ensure_config(cls, config):
+        """从配置管理器解析下载器设置
+        
+        Args:
+            config: 配置管理器实例
+        """
+        if cls._config_source is config:
+            return
+        
+        cls._server_url = config.get('plugin_server.url', 'http://localhost:5000')
+        cls._timeout = config.get('plugin_server.timeout', 30)
+        cls._download_dir = config.get('download_directory') or _default_download_dir()
+        cls._user_agent = f'EdgePlugHub-Client/{config.get("app.version", "0.1.0")}'
+        cls._config_source = config
+    
     def __init__(self, config, repository):
         """初始化插件下载器
         
@@ -37,29 +121,93 @@ class PluginDownloader:
         self.config = config
         self.repository = repository
         
-        # 获取服务器URL
-        self.server_url = self.config.get('plugin_server.url', 'http://localhost:5000')
-        
-        # 设置请求超时时间
-        self.timeout = self.config.get('plugin_server.timeout', 30)
-        
-        # 设置下载目录
-        self.download_dir = self.config.get('download_directory')
-        if not self.download_dir:
-            self.download_dir = os.path.join(os.path.expanduser("~"), ".edgeplughub", "downloads")
+        # 服务器URL、请求超时时间和下载目录
+        self._ensure_config(config)
+        self.server_url = self._server_url
+        self.timeout = self._timeout
+        self.download_dir = self._download_dir
         
         # 确保下载目录存在
         ensure_dir(self.download_dir)
         
         # 创建一个会话对象，用于保持连接
+        # 扩大连接池以支持并发请求，网关错误时自动重试（仅限GET/HEAD等幂等请求）
+        _import_requests()
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_CONNECTIONS,
+            pool_maxsize=_POOL_MAXSIZE,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # 接口响应缓存：URL及查询参数 -> (过期时间, ETag, 原始响应体)
+        # get_plugin_infos会并发调用_cached_get，读写缓存时需持有锁
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        
+        # 服务器是否支持批量获取插件信息，首次请求失败后不再尝试
+        self._batch_info_supported = True
         
         # 设置基本请求头
-        self.session.headers.update({
-            'User-Agent': f'EdgePlugHub-Client/{self.config.get("app.version", "0.1.0")}'
-        })
+        self.session.headers['User-Agent'] = self._user_agent
+        
+        logger.info("插件下载器初始化完成，服务器URL: %s", self.server_url)
+    
+    def _cached_get(self, url, ttl=_CATALOG_TTL, params=None):
+        """带缓存的GET请求，返回解析后的JSON数据
         
-        logger.info(f"插件下载器初始化完成，服务器URL: {self.server_url}")
+        缓存未过期时不发送请求；过期后如果服务器提供过ETag，
+        则带上If-None-Match重新验证，返回304时继续使用缓存的数据
+        
+        Args:
+            url: 请求URL
+            ttl: 缓存时间（秒）
+            params: 查询参数字典，由requests负责编码
+            
+        Returns:
+            解析后的JSON数据，每次调用都是新对象，调用方可以自由修改
+            
+        Raises:
+            requests.RequestException: 请求失败，响应体不是有效JSON时为requests.JSONDecodeError
+        """
+        key = (url, tuple(sorted(params.items()))) if params else url
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry is not None and entry[0] > now:
+            return _parse_json(entry[2])
+        
+        headers = None
+        if entry is not None and entry[1]:
+            headers = {'If-None-Match': entry[1]}
+        
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if entry is not None and response.status_code == 304:
+            etag, body = entry[1], entry[2]
+        else:
+            response.raise_for_status()
+            etag, body = response.headers.get('ETag'), response.content
+        # 缓存原始响应体而非解析结果，避免调用方修改共享的缓存对象；
+        # 解析失败时直接抛出，无效的响应体不进入缓存
+        data = _parse_json(body)
+        
+        # 重新插入到末尾，超出容量时淘汰最久未更新的条目；请求期间不持有锁
+        with self._cache_lock:
+            self._cache.pop(key, None)
+            if len(self._cache) >= _MAX_CACHE_ENTRIES:
+                self._cache.pop(next(iter(self._cache)), None)
+            self._cache[key] = (now + ttl, etag, body)
+        return data
+    
+    def clear_cache(self):
+        """清空接口响应缓存"""
+        with self._cache_lock:
+            self._cache.clear()
     
     def get_server_status(self) -> Dict[str, Any]:
         """获取服务器状态
@@ -69,13 +217,13 @@ class PluginDownloader:
         """
         try:
             url = urljoin(self.server_url, '/api/server/status')
-            logger.debug(f"获取服务器状态: {url}")
+            logger.debug("获取服务器状态: %s", url)
             
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
             
             status = response.json()
-            logger.info(f"服务器状态: 在线")
+            logger.info("服务器状态: 在线")
             
             return {
                 'success': True,
@@ -85,7 +233,7 @@ class PluginDownloader:
             }
             
         except requests.RequestException as e:
-            logger.error(f"获取服务器状态失败: {str(e)}")
+            logger.error("获取服务器状态失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -101,20 +249,14 @@ class PluginDownloader:
             dict: 包含可用插件列表
         """
         try:
-            if category:
-                url = urljoin(self.server_url, f'/api/plugins/available?category={category}')
-            else:
-                url = urljoin(self.server_url, '/api/plugins/available')
-                
-            logger.debug(f"获取可用插件列表: {url}")
-            
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            url = urljoin(self.server_url, '/api/plugins/available')
+            params = {'category': category} if category else None
+            logger.debug("获取可用插件列表: %s %s", url, params or '')
             
-            plugins_data = response.json()
+            plugins_data = self._cached_get(url, _CATALOG_TTL, params)
             plugins = plugins_data if isinstance(plugins_data, list) else plugins_data.get('plugins', [])
             
-            logger.info(f"找到 {len(plugins)} 个可用插件")
+            logger.info("找到 %s 个可用插件", len(plugins))
             
             return {
                 'success': True,
@@ -122,7 +264,7 @@ class PluginDownloader:
             }
             
         except requests.RequestException as e:
-            logger.error(f"获取插件列表失败: {str(e)}")
+            logger.error("获取插件列表失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -139,13 +281,10 @@ class PluginDownloader:
         """
         try:
             url = urljoin(self.server_url, f'/api/plugins/{plugin_id}')
-            logger.debug(f"获取插件信息: {url}")
+            logger.debug("获取插件信息: %s", url)
             
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            plugin_info = response.json()
-            logger.info(f"获取到插件 {plugin_id} 的信息")
+            plugin_info = self._cached_get(url, _PLUGIN_INFO_TTL)
+            logger.info("获取到插件 %s 的信息", plugin_id)
             
             return {
                 'success': True,
@@ -153,12 +292,81 @@ class PluginDownloader:
             }
             
         except requests.RequestException as e:
-            logger.error(f"获取插件 {plugin_id} 信息失败: {str(e)}")
+            logger.error("获取插件 %s 信息失败: %s", plugin_id, e)
             return {
                 'success': False,
                 'error': str(e)
             }
     
+    def get_plugin_infos(self, plugin_ids: List[str]) -> Dict[str, Any]:
+        """获取多个插件的详细信息
+        
+        优先通过 GET /api/plugins?ids=a,b,c 一次请求获取；服务器不支持时
+        并发请求各插件的信息，各请求共用会话的连接池，总耗时约为单次请求的往返时间
+        
+        Args:
+            plugin_ids: 插件ID列表
+            
+        Returns:
+            dict: 插件ID -> 插件详细信息，获取失败的插件不包含在内
+        """
+        plugin_ids = list(dict.fromkeys(plugin_ids))
+        if not plugin_ids:
+            return {}
+        
+        if self._batch_info_supported:
+            infos = self._get_plugin_infos_batch(plugin_ids)
+            if infos is not None:
+                return infos
+        
+        with ThreadPoolExecutor(max_workers=min(_MAX_FETCH_WORKERS, len(plugin_ids))) as executor:
+            results = executor.map(self.get_plugin_info, plugin_ids)
+            return {
+                plugin_id: result['plugin']
+                for plugin_id, result in zip(plugin_ids, results)
+                if result.get('success', False)
+            }
+    
+    def _get_plugin_infos_batch(self, plugin_ids):
+        """通过批量接口获取多个插件的详细信息
+        
+        Args:
+            plugin_ids: 插件ID列表
+            
+        Returns:
+            dict: 插件ID -> 插件详细信息，服务器不支持批量接口时返回None
+        """
+        try:
+            url = urljoin(self.server_url, '/api/plugins')
+            data = self._cached_get(url, _PLUGIN_INFO_TTL, {'ids': ','.join(plugin_ids)})
+        except requests.HTTPError as e:
+            # 4xx表示服务器没有批量接口，之后直接逐个获取
+            logger.debug("批量获取插件信息失败，改为逐个获取: %s", e)
+            if e.response is not None and 400 <= e.response.status_code < 500:
+                self._batch_info_supported = False
+            return None
+        except requests.RequestException as e:
+            logger.debug("批量获取插件信息失败，改为逐个获取: %s", e)
+            return None
+        
+        # 服务器可能返回插件列表、包含plugins字段的字典或ID到信息的映射
+        wanted = set(plugin_ids)
+        if isinstance(data, dict):
+            data = data.get('plugins', data)
+        if isinstance(data, dict):
+            return {
+                plugin_id: info for plugin_id, info in data.items()
+                if plugin_id in wanted and isinstance(info, dict)
+            }
+        if isinstance(data, list):
+            return {
+                info['id']: info for info in data
+                if isinstance(info, dict) and info.get('id') in wanted
+            }
+        
+        self._batch_info_supported = False
+        return None
+    
     def download_plugin(self, plugin_id: str) -> Dict[str, Any]:
         """下载插件
         
@@ -170,64 +378,113 @@ class PluginDownloader:
         """
         try:
             url = urljoin(self.server_url, f'/api/plugins/{plugin_id}/download')
-            logger.info(f"开始下载插件 {plugin_id}: {url}")
+            logger.info("开始下载插件 %s: %s", plugin_id, url)
             
-            # 创建临时文件用于保存下载内容
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
-                temp_path = temp_file.name
-                
-                # 流式下载，避免将大文件完全加载到内存
-                with self.session.get(url, stream=True, timeout=self.timeout) as response:
-                    response.raise_for_status()
-                    
-                    # 获取总文件大小（如果服务器提供）
-                    total_size = int(response.headers.get('content-length', 0))
-                    
-                    # 下载文件
-                    downloaded = 0
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            temp_file.write(chunk)
-                            downloaded += len(chunk)
-                            logger.debug(f"下载进度: {downloaded}/{total_size} ({downloaded/total_size*100:.1f}% 完成)")
-            
-            # 保存到下载目录
+            # 直接下载到目标目录中的.part文件，完成后原子地重命名，
+            # 避免先写临时文件再整体复制
             target_path = os.path.join(self.download_dir, f"{plugin_id}.zip")
+            part_path = f"{target_path}.part"
+            
+            try:
+                with open(part_path, 'wb') as part_file:
+                    # 流式下载，避免将大文件完全加载到内存
+                    with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                        response.raise_for_status()
+                        
+                        # 获取总文件大小（如果服务器提供）
+                        total_size = int(response.headers.get('content-length', 0))
+                        validator = {
+                            'etag': response.headers.get('ETag'),
+                            'last_modified': response.headers.get('Last-Modified')
+                        }
+                        
+                        # 直接读取底层连接，按1 MiB分块写入，由urllib3处理内容编码
+                        raw = response.raw
+                        raw.decode_content = True
+                        
+                        if not logger.isEnabledFor(logging.DEBUG):
+                            shutil.copyfileobj(raw, part_file, _DOWNLOAD_CHUNK_SIZE)
+                        else:
+                            # 调试日志开启时每下载1 MiB记录一次进度
+                            downloaded = 0
+                            for chunk in iter(lambda: raw.read(_DOWNLOAD_CHUNK_SIZE), b''):
+                                part_file.write(chunk)
+                                previous = downloaded
+                                downloaded += len(chunk)
+                                if (downloaded >> 20) != (previous >> 20):
+                                    if total_size:
+                                        logger.debug("下载进度: %d/%d (%.1f%% 完成)",
+                                                     downloaded, total_size, downloaded / total_size * 100)
+                                    else:
+                                        logger.debug("下载进度: %d 字节", downloaded)
+                
+                os.replace(part_path, target_path)
+            except BaseException:
+                # 下载失败时删除不完整的文件
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
             
-            # 复制临时文件到目标位置
-            import shutil
-            shutil.copy2(temp_path, target_path)
-            
-            # 删除临时文件
-            os.unlink(temp_path)
-            
-            logger.info(f"插件 {plugin_id} 下载完成: {target_path}")
+            logger.info("插件 %s 下载完成: %s", plugin_id, target_path)
             
             return {
                 'success': True,
                 'plugin_id': plugin_id,
-                'file_path': target_path
+                'file_path': target_path,
+                'validator': validator
             }
             
         except requests.RequestException as e:
-            logger.error(f"下载插件 {plugin_id} 失败: {str(e)}")
+            logger.error("下载插件 %s 失败: %s", plugin_id, e)
             return {
                 'success': False,
                 'error': str(e)
             }
         except Exception as e:
-            logger.error(f"处理插件 {plugin_id} 下载时发生错误: {str(e)}")
+            logger.error("处理插件 %s 下载时发生错误: %s", plugin_id, e)
             return {
                 'success': False,
                 'error': str(e)
             }
     
-    def download_and_install(self, plugin_id: str, plugin_manager) -> Dict[str, Any]:
+    def is_download_unchanged(self, plugin_id: str) -> bool:
+        """用条件HEAD请求判断插件包自上次安装后是否有变化
+        
+        Args:
+            plugin_id: 插件ID
+            
+        Returns:
+            bool: 服务器返回304时为True；没有校验信息或请求失败时为False
+        """
+        validator = self.repository.get_cache(_DOWNLOAD_VALIDATOR_KEY + plugin_id, persistent=True)
+        if not isinstance(validator, dict):
+            return False
+        
+        headers = {}
+        if validator.get('etag'):
+            headers['If-None-Match'] = validator['etag']
+        if validator.get('last_modified'):
+            headers['If-Modified-Since'] = validator['last_modified']
+        if not headers:
+            return False
+        
+        try:
+            url = urljoin(self.server_url, f'/api/plugins/{plugin_id}/download')
+            response = self.session.head(url, headers=headers, timeout=self.timeout,
+                                         allow_redirects=True)
+            return response.status_code == 304
+        except requests.RequestException as e:
+            logger.debug("检查插件 %s 是否有更新失败: %s", plugin_id, e)
+            return False
+    
+    def download_and_install(self, plugin_id: str, plugin_manager,
+                             server_plugin: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """下载并安装插件
         
         Args:
             plugin_id: 插件ID
             plugin_manager: 插件管理器实例
+            server_plugin: 可选，预先获取的服务器端插件信息，提供时不再单独请求
             
         Returns:
             dict: 安装结果
@@ -236,20 +493,32 @@ class PluginDownloader:
             # 首先检查插件是否已安装
             existing_plugin = self.repository.get_plugin(plugin_id)
             if existing_plugin:
-                logger.info(f"插件 {plugin_id} 已安装，版本: {existing_plugin.get('version', '未知')}")
+                logger.info("插件 %s 已安装，版本: %s", plugin_id, existing_plugin.get('version', '未知'))
+                local_version = existing_plugin.get('version', '0.0.0')
+                
+                # 插件包自上次安装后没有变化时，无需获取和解析插件信息；
+                # 已预先获取插件信息时直接比较版本，不再额外请求
+                if server_plugin is None and self.is_download_unchanged(plugin_id):
+                    logger.info("插件 %s 已是最新版本: %s", plugin_id, local_version)
+                    return {
+                        'success': True,
+                        'plugin_id': plugin_id,
+                        'status': 'up_to_date',
+                        'version': local_version
+                    }
                 
                 # 获取服务器上的插件信息以比较版本
-                server_info = self.get_plugin_info(plugin_id)
-                if not server_info.get('success', False):
-                    return server_info
+                if server_plugin is None:
+                    server_info = self.get_plugin_info(plugin_id)
+                    if not server_info.get('success', False):
+                        return server_info
+                    server_plugin = server_info.get('plugin', {})
                 
-                server_plugin = server_info.get('plugin', {})
                 server_version = server_plugin.get('version', '0.0.0')
-                local_version = existing_plugin.get('version', '0.0.0')
                 
                 # 如果本地版本已是最新，不需要重新下载
                 if server_version == local_version:
-                    logger.info(f"插件 {plugin_id} 已是最新版本: {local_version}")
+                    logger.info("插件 %s 已是最新版本: %s", plugin_id, local_version)
                     return {
                         'success': True,
                         'plugin_id': plugin_id,
@@ -266,26 +535,51 @@ class PluginDownloader:
             plugin_file = download_result.get('file_path')
             
             # 安装插件
-            logger.info(f"安装插件: {plugin_file}")
+            logger.info("安装插件: %s", plugin_file)
             install_result = plugin_manager.install_plugin(plugin_file, enable=True)
             
+            # 安装成功后记录插件包的校验信息，之后可用条件请求判断插件包是否有变化
+            validator = download_result.get('validator') or {}
+            if install_result.get('success', False) and (validator.get('etag') or validator.get('last_modified')):
+                self.repository.save_cache(_DOWNLOAD_VALIDATOR_KEY + plugin_id, validator,
+                                           ttl=0, persistent=True)
+            
             # 安装成功后，不再需要zip文件
             if install_result.get('success', False) and os.path.exists(plugin_file):
                 try:
                     os.remove(plugin_file)
-                    logger.debug(f"已删除插件临时文件: {plugin_file}")
+                    logger.debug("已删除插件临时文件: %s", plugin_file)
                 except:
                     pass
             
             return install_result
             
         except Exception as e:
-            logger.error(f"下载并安装插件 {plugin_id} 失败: {str(e)}")
+            logger.error("下载并安装插件 %s 失败: %s", plugin_id, e)
             return {
                 'success': False,
                 'error': str(e)
             }
     
+    def download_and_install_many(self, plugin_ids: List[str], plugin_manager) -> Dict[str, Any]:
+        """下载并安装（或更新）多个插件
+        
+        先一次性获取所有插件在服务器上的信息，再逐个与本地版本比较，
+        避免每个插件单独请求一次
+        
+        Args:
+            plugin_ids: 插件ID列表
+            plugin_manager: 插件管理器实例
+            
+        Returns:
+            dict: 插件ID -> 安装结果
+        """
+        server_plugins = self.get_plugin_infos(plugin_ids)
+        return {
+            plugin_id: self.download_and_install(plugin_id, plugin_manager, server_plugins.get(plugin_id))
+            for plugin_id in dict.fromkeys(plugin_ids)
+        }
+    
     def get_plugin_categories(self) -> Dict[str, Any]:
         """获取插件类别列表
         
@@ -294,12 +588,9 @@ class PluginDownloader:
         """
         try:
             url = urljoin(self.server_url, '/api/plugins/categories')
-            logger.debug(f"获取插件类别: {url}")
-            
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            logger.debug("获取插件类别: %s", url)
             
-            categories_data = response.json()
+            categories_data = self._cached_get(url, _CATEGORIES_TTL)
             
             # 服务器可能返回列表或包含categories字段的字典
             if isinstance(categories_data, list):
@@ -308,11 +599,11 @@ class PluginDownloader:
                 for category in categories_data:
                     if isinstance(category, str):
                         categories[category] = 0  # 默认数量为0
-                logger.info(f"从列表格式获取到 {len(categories)} 个插件类别")
+                logger.info("从列表格式获取到 %s 个插件类别", len(categories))
             else:
                 # 从字典中提取categories字段
                 categories = categories_data.get('categories', {})
-                logger.info(f"从字典格式获取到 {len(categories)} 个插件类别")
+                logger.info("从字典格式获取到 %s 个插件类别", len(categories))
             
             return {
                 'success': True,
@@ -320,7 +611,7 @@ class PluginDownloader:
             }
             
         except requests.RequestException as e:
-            logger.error(f"获取插件类别失败: {str(e)}")
+            logger.error("获取插件类别失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -336,16 +627,14 @@ class PluginDownloader:
             dict: 搜索结果
         """
         try:
-            url = urljoin(self.server_url, f'/api/plugins/search?q={query}')
-            logger.debug(f"搜索插件: {url}")
-            
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            # 查询参数交由requests进行百分号编码，空格和&等字符不会破坏URL
+            url = urljoin(self.server_url, '/api/plugins/search')
+            logger.debug("搜索插件: %s q=%s", url, query)
             
-            search_results = response.json()
+            search_results = self._cached_get(url, _CATALOG_TTL, {'q': query})
             plugins = search_results.get('plugins', [])
             
-            logger.info(f"搜索 '{query}' 找到 {len(plugins)} 个插件")
+            logger.info("搜索 '%s' 找到 %s 个插件", query, len(plugins))
             
             return {
                 'success': True,
@@ -353,7 +642,7 @@ class PluginDownloader:
             }
             
         except requests.RequestException as e:
-            logger.error(f"搜索插件失败: {str(e)}")
+            logger.error("搜索插件失败: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -363,6 +652,7 @@ class PluginDownloader:
         """清理下载器资源"""
         try:
             # 关闭会话
+            self.clear_cache()
             self.session.close()
             logger.debug("已关闭插件下载器会话")
         except:
@@ -189,15 +189,16 @@ class PluginManager:
                 self._analyze_plugin_dependencies(enabled_plugins)
                 
                 # 按照依赖关系顺序加载插件
+                plugins_by_id = {p['id']: p for p in enabled_plugins}
                 loaded_count = 0
                 for plugin_id in self.plugin_load_order:
                     try:
-                        plugin_data = next((p for p in enabled_plugins if p['id'] == plugin_id), None)
+                        plugin_data = plugins_by_id.get(plugin_id)
                         if not plugin_data:
                             continue
                         
-                        # 加载插件
-                        if self.load_plugin(plugin_id):
+                        # 加载插件，直接使用已查询到的插件信息
+                        if self.load_plugin(plugin_id, plugin_data):
                             loaded_count += 1
                     except Exception as e:
                         self.logger.error(f"加载插件 {plugin_id} 失败: {str(e)}", exc_info=True)
@@ -270,11 +271,12 @@ class PluginManager:
                 if plugin_id not in self.plugin_load_order:
                     self.plugin_load_order.append(plugin_id)
     
-    def load_plugin(self, plugin_id):
+    def load_plugin(self, plugin_id, plugin_data=None):
         """加载指定的插件
         
         Args:
             plugin_id: 插件ID
+            plugin_data: 可选，已从数据库查询到的插件信息，提供时不再重复查询
             
         Returns:
             bool: 是否成功加载
@@ -287,7 +289,8 @@ class PluginManager:
             
             try:
                 # 从数据库获取插件信息
-                plugin_data = self.repository.get_plugin(plugin_id)
+                if plugin_data is None:
+                    plugin_data = self.repository.get_plugin(plugin_id)
                 if not plugin_data:
                     raise PluginLoadError(f"找不到插件 {plugin_id} 的信息", plugin_id=plugin_id)
                 
@@ -371,6 +374,10 @@ class PluginManager:
                 # 存储插件实例
                 self.loaded_plugins[plugin_id] = plugin_instance
                 
+                # 插件可以直接通过管理器调用其他插件的API
+                if hasattr(plugin_instance, 'set_manager'):
+                    plugin_instance.set_manager(self)
+                
                 # 初始化并启动插件
                 plugin_instance.initialize()
                 plugin_instance.start()
@@ -798,6 +805,17 @@ class PluginManager:
                 self.logger.error(f"禁用插件 {plugin_id} 失败: {str(e)}", exc_info=True)
             return False
     
+    def get_plugin_instance(self, plugin_id):
+        """获取已加载的插件实例
+        
+        Args:
+            plugin_id: 插件ID
+            
+        Returns:
+            插件实例，未加载时返回None
+        """
+        return self.loaded_plugins.get(plugin_id)
+    
     def get_plugin_info(self, plugin_id):
         """获取插件信息
         
@@ -5,11 +5,16 @@
 核心模块测试脚本
 """
 
+import io
 import os
 import sys
 import time
 import logging
+import shutil
+import tempfile
 import threading
+import subprocess
+import contextlib
 
 # 添加父目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -45,6 +50,84 @@ def test_main_thread_callback(data):
     print(f"当前线程ID: {thread_id}, 主线程ID: {main_thread_id}")
     print(f"是否在主线程执行: {thread_id == main_thread_id}")
 
+def test_thread_manager_exit():
+    """测试未调用shutdown时进程仍能正常退出"""
+    print("\n=== 测试4: 线程池退出 ===")
+    
+    # 常驻工作线程阻塞在任务队列上，进程退出时需自动停止，否则会挂起
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "from core.threading import ThreadManager\n"
+        "manager = ThreadManager(2)\n"
+        "manager.run_task(print, 'task')\n"
+        "manager.wait_for_finished()\n"
+    )
+    try:
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, timeout=30)
+    except subprocess.TimeoutExpired:
+        raise AssertionError("未调用shutdown的进程退出时挂起")
+    assert result.returncode == 0, f"进程退出码错误: {result.returncode}"
+    
+    print("线程池退出测试通过")
+
+def test_child_logger_file_output():
+    """测试子日志记录器的记录写入日志文件"""
+    print("\n=== 测试5: 子日志记录器 ===")
+    
+    from core.logging_manager import LoggingManager
+    
+    log_dir = tempfile.mkdtemp()
+    try:
+        manager = LoggingManager(log_dir=log_dir, console_output=False)
+        manager.get_logger("plugin.test")
+        
+        # 子记录器未单独配置，记录经传播由父记录器写入文件
+        logging.getLogger("app.sub").info("child-of-app")
+        logging.getLogger("plugin.test.child").info("child-of-plugin")
+        manager.shutdown()
+        
+        content = ""
+        for log_file in manager.get_log_files():
+            with open(log_file, encoding="utf-8") as f:
+                content += f.read()
+        assert "child-of-app" in content, "app子记录器的日志未写入文件"
+        assert "child-of-plugin" in content, "插件子记录器的日志未写入文件"
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+    
+    print("子日志记录器测试通过")
+
+class _FakePluginManager:
+    """返回预设插件信息的模拟插件管理器"""
+    
+    def __init__(self, plugins):
+        self.plugins = plugins
+    
+    def get_all_plugins_info(self):
+        return self.plugins
+
+def test_list_plugins_missing_fields():
+    """测试插件信息缺少字段时的插件列表输出"""
+    print("\n=== 测试6: 插件列表 ===")
+    
+    from app import EdgePlugHubApp
+    
+    app = EdgePlugHubApp.__new__(EdgePlugHubApp)
+    app.__dict__["_plugin_manager"] = _FakePluginManager([
+        {"id": "full", "name": "完整插件", "version": "1.0.0", "enabled": True},
+        {"id": "partial", "name": None, "version": None, "description": None},
+        {"id": None}
+    ])
+    
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        app._list_plugins()
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 4, f"插件列表行数错误: {lines}"
+    assert lines[2].split() == ["partial", "partial", "unknown", "禁用"], f"缺失字段未正确填充: {lines[2]}"
+    
+    print("插件列表测试通过")
+
 def main():
     """测试主函数"""
     # 创建Qt应用程序，用于测试主线程回调
@@ -109,6 +192,10 @@ def main():
     
     # 停止核心
     core.stop()
+    
+    test_thread_manager_exit()
+    test_child_logger_file_output()
+    test_list_plugins_missing_fields()
     print("\n=== 测试完成 ===")
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@
 
 import os
 import sys
+import copy
 import time
 import logging
 import threading
@@ -63,6 +64,34 @@ def test_plugin_manager(app_core):
     
     print("插件管理器测试通过")
 
+def test_plugin_info_isolation(app_core):
+    """测试插件运行时信息与缓存的清单相互独立"""
+    print("\n=== 测试7: 插件运行时信息 ===")
+    
+    plugin_manager = app_core.plugin_manager
+    plugin_id = next(
+        (p["id"] for p in plugin_manager.get_all_plugins_info() if plugin_manager.load_plugin(p["id"])),
+        None
+    )
+    if plugin_id is None:
+        print("没有可加载的插件，跳过")
+        return
+    
+    plugin = plugin_manager.get_plugin_instance(plugin_id)
+    info = plugin.get_info()
+    expected = copy.deepcopy(info)
+    
+    # 修改返回值中的嵌套对象不应影响之后的调用
+    for value in info.values():
+        if isinstance(value, list):
+            value.append("changed")
+        elif isinstance(value, dict):
+            value["changed"] = True
+    assert plugin.get_info() == expected, "修改get_info的返回值影响了缓存的清单"
+    
+    plugin_manager.unload_plugin(plugin_id)
+    print("插件运行时信息测试通过")
+
 def test_async_operations(app_core):
     """测试异步操作"""
     print("\n=== 测试3: 异步操作 ===")
@@ -107,6 +136,122 @@ def test_async_operations(app_core):
     
     print("异步操作测试通过")
 
+def test_repository_transaction(app_core):
+    """测试数据仓库事务的回滚"""
+    print("\n=== 测试6: 数据仓库事务 ===")
+    
+    repository = app_core.repository
+    
+    # 准备足够多的过期持久缓存，清理时会触发空闲页回收
+    with repository.transaction() as cursor:
+        cursor.executemany(
+            "INSERT OR REPLACE INTO cache (key, value, expiry) VALUES (?, ?, 1)",
+            [(f"test_expired_{i}", "expired") for i in range(200)]
+        )
+    
+    repository.save_plugin({"id": "test_tx_plugin", "name": "事务测试插件", "version": "1.0.0"})
+    repository.save_plugin_config("test_tx_plugin", "key", "value")
+    repository.save_cache("test_tx_cache", "value", persistent=True)
+    
+    # 事务内调用的读写方法及缓存清理都不能提前提交外层事务
+    try:
+        with repository.transaction():
+            repository.save_preference("test_tx_pref", "pending")
+            repository.delete_plugin_config("test_tx_plugin", "key")
+            repository.delete_cache("test_tx_cache", persistent=True)
+            repository.get_preference("test_tx_pref")
+            repository.clear_expired_cache()
+            raise RuntimeError("触发回滚")
+    except RuntimeError:
+        pass
+    assert repository.get_preference("test_tx_pref") is None, "事务回滚后偏好设置仍然存在"
+    assert repository.get_plugin_config("test_tx_plugin", "key") == "value", "事务回滚后插件配置被删除"
+    assert repository.get_cache("test_tx_cache", persistent=True) == "value", "事务回滚后持久缓存被删除"
+    
+    repository.delete_plugin("test_tx_plugin")
+    repository.delete_cache("test_tx_cache", persistent=True)
+    
+    print("数据仓库事务测试通过")
+
+class _FakeResponse:
+    """模拟的HTTP响应"""
+    
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+    
+    def raise_for_status(self):
+        pass
+
+class _FakeSession:
+    """按顺序返回预设响应的模拟会话"""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+    
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+    
+    def close(self):
+        pass
+
+class _PluginInfoSession:
+    """按URL末段返回插件信息的模拟会话，可被多个线程同时调用"""
+    
+    def get(self, url, **kwargs):
+        plugin_id = url.rsplit("/", 1)[-1]
+        return _FakeResponse(f'{{"id": "{plugin_id}"}}'.encode("utf-8"))
+    
+    def close(self):
+        pass
+
+def test_downloader_cache(app_core):
+    """测试下载器的响应缓存"""
+    print("\n=== 测试4: 下载器响应缓存 ===")
+    
+    from plugins.downloader import PluginDownloader
+    downloader = PluginDownloader(app_core.config, app_core.repository)
+    downloader.session = _FakeSession([
+        _FakeResponse(b"<html>502 Bad Gateway</html>"),
+        _FakeResponse(b'{"plugins": [{"id": "demo"}]}')
+    ])
+    
+    # 非JSON响应体返回失败结果，且不进入缓存
+    result = downloader.get_available_plugins()
+    assert not result["success"], f"非JSON响应应返回失败: {result}"
+    
+    result = downloader.get_available_plugins()
+    assert result["plugins"] == [{"id": "demo"}], f"插件列表错误: {result}"
+    
+    # 修改返回值不影响缓存中的数据，缓存命中时不再发送请求
+    result["plugins"].append({"id": "changed"})
+    result = downloader.get_available_plugins()
+    assert result["plugins"] == [{"id": "demo"}], f"缓存数据被修改: {result}"
+    assert downloader.session.calls == 2, f"请求次数错误: {downloader.session.calls}"
+    
+    print("下载器响应缓存测试通过")
+
+def test_downloader_concurrent_fetch(app_core):
+    """测试并发获取插件信息时的响应缓存"""
+    print("\n=== 测试5: 并发获取插件信息 ===")
+    
+    from plugins.downloader import PluginDownloader, _MAX_CACHE_ENTRIES
+    downloader = PluginDownloader(app_core.config, app_core.repository)
+    downloader.session = _PluginInfoSession()
+    downloader._batch_info_supported = False
+    
+    # 插件数超过缓存容量，并发写入时持续触发淘汰
+    plugin_ids = [f"plugin_{i}" for i in range(_MAX_CACHE_ENTRIES * 4)]
+    infos = downloader.get_plugin_infos(plugin_ids)
+    assert len(infos) == len(plugin_ids), f"获取到的插件信息数量错误: {len(infos)}"
+    assert all(infos[plugin_id]["id"] == plugin_id for plugin_id in plugin_ids), "插件信息不匹配"
+    assert len(downloader._cache) <= _MAX_CACHE_ENTRIES, f"缓存超出容量: {len(downloader._cache)}"
+    
+    print("并发获取插件信息测试通过")
+
 def main():
     """测试主函数"""
     # 创建Qt应用程序
@@ -125,6 +270,10 @@ def main():
         test_repository(app_core)
         test_plugin_manager(app_core)
         test_async_operations(app_core)
+        test_downloader_cache(app_core)
+        test_downloader_concurrent_fetch(app_core)
+        test_repository_transaction(app_core)
+        test_plugin_info_isolation(app_core)
         
         print("\n=== 所有测试完成 ===")
         